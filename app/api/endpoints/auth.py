@@ -1,25 +1,38 @@
 import pytz
+from typing import Optional
 from fastapi import APIRouter, BackgroundTasks
-from fastapi import Form
+from fastapi import Form, Query, Request, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import EmailStr
 from sqlalchemy.exc import SQLAlchemyError
 
+from app.core.responses import PrevalidatedResponse
 from app.core.security import *
-from app.crud.persona import update_persona
+from app.crud.persona import update_persona, get_persona_by_id
+from app.crud.email_outbox import enqueue_email
+from app.crud.refresh_token import revoke_refresh_token
 from app.crud.token import create_token, verify_token
-from app.crud.user import get_user_id_by_email, create_user
-from app.db.session import get_db
+from app.crud.user import get_user_id_by_email, create_user, update_password_hash, search_users
+from app.db.session import get_db, get_read_db
+from app.models.domain.persona import SkillLevel
 from app.models.domain.token import AuthToken
 from app.models.domain.user import User, Role
 from app.models.schema.persona import PersonaResponse, PersonaUpdate
-from app.models.schema.user import UserCreate, UserResponse, UserWithPersonaResponse, UserUpdate, Token, TokenData
-from app.services.crypt import verify_password
-from app.services.email_service import send_email
+from app.models.schema.user import (
+    UserCreate, UserResponse, UserWithPersonaResponse, UserUpdate, Token, CurrentUser, UserImportReport
+)
+from app.services.crypt import verify_and_update_password_async
+from app.services.email_service import process_email_outbox
 from app.services.multi_crud_service import reset_password
+from app.services.user_import_service import import_users_from_csv
+from app.services.rate_limit import (
+    login_rate_limit, reset_password_send_rate_limit, reset_password_code_rate_limit
+)
 from app.services.verify import verify_structure_password
+from app.services.profiling import ProfiledRoute
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 ALL_AUTH_ROLES = [Role.ADMIN, Role.NORMAL]
 
@@ -85,8 +98,9 @@ def register_user(register_data: UserCreate,
     return new_user
 
 
-@router.post("/token", response_model=Token)
-def login_for_access_token(
+@router.post("/token", response_model=Token, dependencies=[Depends(login_rate_limit)])
+async def login_for_access_token(
+        request: Request,
         form_data: OAuth2PasswordRequestForm = Depends(),
         db: Session = Depends(get_db)
 ):
@@ -106,20 +120,91 @@ def login_for_access_token(
     - **password** (requerido): Contraseña del usuario.
     """
 
-    user = get_user(db, email=form_data.username)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = await run_in_threadpool(get_user, db, form_data.username)
+
+    # La verificación de bcrypt se hace en el pool de procesos, sin ocupar hilos
+    is_valid, new_hash = False, None
+    if user:
+        is_valid, new_hash = await verify_and_update_password_async(form_data.password, user.hashed_password)
+
+    if not is_valid:
+        # Solo los intentos fallidos cuentan para el límite por cuenta
+        await login_rate_limit.record_account_failure(request, form_data.username)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Email o contraseña incorrectos.",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+
+    # Los claims se leen antes del commit del rehash: después el usuario queda expirado
+    # y leer sus atributos haría un SELECT bloqueante en el event loop
+    claims = build_access_token_claims(user)
+
+    # Rehash con el costo configurado actualmente
+    if new_hash:
+        await run_in_threadpool(update_password_hash, db, user, new_hash)
+
+    access_token_expires = timedelta(minutes=ACCESS_TOKEN_TTL_MINUTES)
+    access_token = create_access_token(data=claims, expires_delta=access_token_expires)
+    refresh_token = await run_in_threadpool(issue_refresh_token, db, claims["uid"])
+    return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
+
+
+@router.post("/refresh", response_model=Token)
+def refresh_access_token(
+        refresh_token: str = Form(...),
+        db: Session = Depends(get_db)
+):
+    """
+    English:
+    --------
+    Refresh Access Token:
+
+    - **refresh_token** (required): Refresh token obtained at login. It is rotated on every use,
+      so the returned refresh token must replace the previous one.
+
+    Español:
+    --------
+    Renovar el token de acceso:
+
+    - **refresh_token** (requerido): Refresh token obtenido al iniciar sesión. Se rota en cada uso,
+      por lo que el refresh token devuelto debe reemplazar al anterior.
+    """
+    user, new_refresh_token = rotate_refresh_token(db, refresh_token)
     access_token = create_access_token(
-        data={"sub": user.email, "role": user.role}, expires_delta=access_token_expires
+        data=build_access_token_claims(user),
+        expires_delta=timedelta(minutes=ACCESS_TOKEN_TTL_MINUTES)
     )
-    return {"access_token": access_token, "token_type": "bearer"}
+    return {"access_token": access_token, "refresh_token": new_refresh_token, "token_type": "bearer"}
+
+
+@router.post("/logout")
+def logout(
+        refresh_token: str = Form(...),
+        db: Session = Depends(get_db)
+):
+    """
+    English:
+    --------
+    Logout: revokes the given refresh token.
+
+    - **refresh_token** (required): Refresh token to revoke.
 
-@router.post('/reset_password/send')
+    Español:
+    --------
+    Cerrar sesión: revoca el refresh token enviado.
+
+    - **refresh_token** (requerido): Refresh token a revocar.
+    """
+    credentials_exception = HTTPException(status_code=401, detail="Refresh token inválido")
+    payload = decode_token(refresh_token, credentials_exception)
+    if payload.get("type") != "refresh":
+        raise credentials_exception
+
+    revoke_refresh_token(db, payload.get("jti"))
+    return {"message": "Sesión cerrada exitosamente."}
+
+@router.post('/reset_password/send', dependencies=[Depends(reset_password_send_rate_limit)])
 async def send_reset_password_code(
         background_tasks: BackgroundTasks,
         email: EmailStr = Form(...),
@@ -168,8 +253,9 @@ async def send_reset_password_code(
             }
         }
 
-        # Enviar el email en segundo plano
-        background_tasks.add_task(send_email, email, subject, context, "email.html")
+        # Guardar el email en la bandeja de salida y procesarla en segundo plano
+        enqueue_email(db, email, subject, "email.html", context)
+        background_tasks.add_task(process_email_outbox)
 
         return {"message": "El código fue enviado exitosamente."}
 
@@ -183,7 +269,8 @@ async def send_reset_password_code(
 
 
 
-@router.post('/reset_password/verify', response_model=dict)
+@router.post('/reset_password/verify', response_model=dict,
+             dependencies=[Depends(reset_password_code_rate_limit)])
 async def verify_password_code(
         code: int,
         db: Session = Depends(get_db)
@@ -209,7 +296,8 @@ async def verify_password_code(
     raise HTTPException(status_code=400, detail="Código invalido")
 
 
-@router.post('/reset_password/reset', response_model=dict)
+@router.post('/reset_password/reset', response_model=dict,
+             dependencies=[Depends(reset_password_code_rate_limit)])
 async def reset_forgotten_password(
         code: int,
         new_password: str,
@@ -244,7 +332,7 @@ async def reset_forgotten_password(
 
 @router.delete("/delete/{user_id}", response_model=UserResponse)
 def delete_user_and_persona(user_id: int, db: Session = Depends(get_db),
-                            current_user: TokenData = Depends(get_current_user)
+                            current_user: CurrentUser = Depends(get_current_user)
 
                             ):
     """
@@ -273,6 +361,7 @@ def delete_user_and_persona(user_id: int, db: Session = Depends(get_db),
 
         # Obtener la persona asociada al usuario
         persona = user.person
+        invalidate_current_user(user.email)
 
         # Eliminar el usuario
         db.delete(user)
@@ -291,37 +380,61 @@ def delete_user_and_persona(user_id: int, db: Session = Depends(get_db),
 
 
 @router.get("/users", response_model=list[UserWithPersonaResponse])
-def get_users(db: Session = Depends(get_db),
-              current_user: TokenData = Depends(get_current_user)
+def get_users(page: int = Query(1, ge=1),
+              page_size: int = Query(50, ge=1, le=200),
+              search: Optional[str] = None,
+              role: Optional[Role] = None,
+              skill_level: Optional[SkillLevel] = None,
+              include_picture: bool = True,
+              db: Session = Depends(get_read_db),
+              current_user: CurrentUser = Depends(require_role(Role.ADMIN))
               ):
     """
     Get all registered users with their roles and associated personal information.
 
     English:
     --------
-    Returns a list of all registered users, including their roles and associated personal data.
+    Returns a page of registered users, including their roles and associated personal data.
+    The total number of matching users is returned in the **X-Total-Count** header.
+
+    - **page** (optional): Page number, starting at 1. Defaults to 1.
+    - **page_size** (optional): Users per page (1 to 200). Defaults to 50.
+    - **search** (optional): Text to search in first name, last name, email, phone number or city.
+    - **role** (optional): Filter by role (**Admin**, **Normal**).
+    - **skill_level** (optional): Filter by skill level (**Alto**, **Medio**, **Bajo**).
+    - **include_picture** (optional): Whether to include profile pictures. Defaults to True.
 
     Español:
     --------
-    Obtiene una lista de todos los usuarios registrados, incluyendo su rol y la información personal asociada.
+    Obtiene una página de los usuarios registrados, incluyendo su rol y la información personal asociada.
+    El total de usuarios que cumplen los filtros se devuelve en la cabecera **X-Total-Count**.
+
+    - **page** (opcional): Número de página, empezando en 1. Por defecto 1.
+    - **page_size** (opcional): Usuarios por página (1 a 200). Por defecto 50.
+    - **search** (opcional): Texto a buscar en nombres, apellidos, correo, teléfono o ciudad.
+    - **role** (opcional): Filtrar por rol (**Admin**, **Normal**).
+    - **skill_level** (opcional): Filtrar por nivel de habilidad (**Alto**, **Medio**, **Bajo**).
+    - **include_picture** (opcional): Si se incluyen las fotos de perfil. Por defecto True.
     """
-    if current_user.role.value not in [Role.ADMIN]:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-
     try:
-        # Consultar todos los usuarios con la persona asociada
-        users = db.query(User).all()
-
-        if not users:
-            raise HTTPException(status_code=404, detail="No se encontraron usuarios")
-
+        # Consultar los usuarios con la persona asociada en una sola consulta
+        users, total = search_users(
+            db,
+            skip=(page - 1) * page_size,
+            limit=page_size,
+            search=search,
+            role=role,
+            skill_level=skill_level,
+            include_picture=include_picture
+        )
         # Mapear la respuesta para incluir el rol y la persona
         user_responses = [
-            UserWithPersonaResponse.from_orm_custom(user)
+            UserWithPersonaResponse.from_orm_custom(user, include_picture=include_picture)
             for user in users
         ]
 
-        return user_responses  # Devolvemos la lista de usuarios con la persona y el rol
+        # Devolvemos la lista de usuarios con la persona y el rol (ya validada, sin volver a validarla)
+        return PrevalidatedResponse(user_responses, headers={"X-Total-Count": str(total)})
 
     except Exception as e:
         # Agregar más detalles sobre el error
@@ -329,24 +442,52 @@ def get_users(db: Session = Depends(get_db),
         raise HTTPException(status_code=500, detail=f"Error al obtener los usuarios: {str(e)}")
 
 
+@router.post("/users/import", response_model=UserImportReport)
+def import_users(file: UploadFile = File(...),
+                 db: Session = Depends(get_db),
+                 current_user: CurrentUser = Depends(require_role(Role.ADMIN))
+                 ):
+    """
+    Import Users from CSV / Importar Usuarios desde CSV
+
+    English:
+    --------
+    Creates users in bulk from a UTF-8 CSV file. Each row is validated with the same rules as
+    **/auth/register**. Valid rows are created and invalid ones are reported with their row number.
+
+    - **file** (required): CSV with the columns **email**, **password**, **first_name**, **last_name**,
+      **phone_number**, **city**, **neighborhood**, **blood_type**, **skill_level** and optionally **role**.
+
+    Español:
+    --------
+    Crea usuarios de forma masiva a partir de un archivo CSV en UTF-8. Cada fila se valida con las mismas
+    reglas de **/auth/register**. Las filas válidas se crean y las inválidas se reportan con su número de fila.
+
+    - **file** (requerido): CSV con las columnas **email**, **password**, **first_name**, **last_name**,
+      **phone_number**, **city**, **neighborhood**, **blood_type**, **skill_level** y opcionalmente **role**.
+    """
+    return import_users_from_csv(db, file.file)
+
+
 @router.get("/my_profile", response_model=PersonaResponse)
-def get_my_profile(db: Session = Depends(get_db),
-                   current_user: User = Depends(get_current_user)):
+def get_my_profile(db: Session = Depends(get_read_db),
+                   current_user: CurrentUser = Depends(get_token_user)):
     """
     Obtener el perfil del usuario autenticado, solo con la información personal (persona).
     """
     try:
-        if not current_user.person:
+        persona = get_persona_by_id(db, current_user.person_id)
+        if not persona:
             raise HTTPException(status_code=404, detail="No se encontró información de persona asociada")
 
-        return PersonaResponse.from_orm(current_user.person)
+        return PersonaResponse.from_orm(persona)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al obtener el perfil: {str(e)}")
 
 @router.put("/update/basic_information/{persona_id}", response_model=PersonaResponse)
 def update_basic_info(persona_id: int, persona_update: PersonaUpdate, db: Session = Depends(get_db),
-                      current_user: TokenData = Depends(get_current_user)
+                      current_user: CurrentUser = Depends(get_current_user)
                       ):
     """
     Update a person's information / Actualizar información de una persona
@@ -402,7 +543,7 @@ def update_basic_info(persona_id: int, persona_update: PersonaUpdate, db: Sessio
 @router.put("/update/role/{user_id}", response_model=UserResponse)
 def update_user_role(user_id: int, user_update: UserUpdate,
                      db: Session = Depends(get_db),
-                     current_user: TokenData = Depends(get_current_user)
+                     current_user: CurrentUser = Depends(get_current_user)
                      ):
     """
     Update a User's Role / Actualizar el Rol de un Usuario
@@ -439,6 +580,7 @@ def update_user_role(user_id: int, user_update: UserUpdate,
         # Guardar los cambios en la base de datos
         db.commit()
         db.refresh(user)
+        invalidate_current_user(user.email)
 
         # Devolver la respuesta con el usuario actualizado
         return UserResponse.from_orm_custom(user)
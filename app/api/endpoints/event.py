@@ -1,21 +1,27 @@
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
 from typing import List
-from app.core.security import get_current_user
-from app.db.session import get_db
+from app.core.responses import PrevalidatedResponse
+from app.core.security import get_current_user, require_role
+from app.crud.aio import event as event_aio
+from app.db.async_session import get_async_db
+from app.db.session import get_db, get_read_db
 from app.models.domain.event import Event
 from app.models.domain.user import Role
 from app.models.schema.event import EventCreate, EventResponse, EventUpdate, NextEventPublicResponse
-from app.crud.event import create_event, get_events, update_event, delete_event
-from app.models.schema.user import TokenData
+from app.crud.event import create_event, update_event, delete_event
+from app.models.schema.user import CurrentUser
+from app.services.feed_service import clear_feed_cache
+from app.services.profiling import ProfiledRoute
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 ALL_AUTH_ROLES = [Role.ADMIN, Role.NORMAL]
 @router.post("/create", response_model=EventResponse)
 def create_new_event(event: EventCreate, db: Session = Depends(get_db),
-                     current_user: TokenData = Depends(get_current_user)):
+                     current_user: CurrentUser = Depends(get_current_user)):
     """
      Create a New Event / Crear un Nuevo Evento
 
@@ -48,14 +54,17 @@ def create_new_event(event: EventCreate, db: Session = Depends(get_db),
         raise HTTPException(status_code=403, detail="Not enough permissions")
 
     try:
-        return create_event(db, event)
+        new_event = create_event(db, event)
+        clear_feed_cache()
+        return new_event
     except ValueError as ve:
         raise HTTPException(status_code=422, detail=f"Validación fallida: {str(ve)}")
     except Exception as e:
         print(f"Error interno en crear evento: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error interno del servidor: {str(e)}")
 @router.get("/", response_model=List[EventResponse])
-def read_all_events(db: Session = Depends(get_db), current_user: TokenData = Depends(get_current_user)):
+async def read_all_events(db: AsyncSession = Depends(get_async_db),
+                          current_user: CurrentUser = Depends(require_role(Role.ADMIN, Role.NORMAL))):
     """
           Get all registered events with their details.
 
@@ -68,18 +77,15 @@ def read_all_events(db: Session = Depends(get_db), current_user: TokenData = Dep
           Devuelve una lista de todos los eventos registrados, incluyendo su tipo, ruta asociada, nivel del evento, imagen, fecha de creación y estado de disponibilidad.
 
     """
-    if current_user.role.value not in ALL_AUTH_ROLES:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-
-    events = get_events(db)
+    events = await event_aio.get_events(db)
 
     event_responses = [EventResponse.from_orm(event) for event in events]
 
-    return event_responses
+    return PrevalidatedResponse(event_responses)
 
 @router.put("/update/{event_id}", response_model=EventResponse)
 def modify_event(event_id: int, event_data: EventUpdate, db: Session = Depends(get_db),
-                 current_user: TokenData = Depends(get_current_user)
+                 current_user: CurrentUser = Depends(get_current_user)
                  ):
     """
      Update event details by its ID.
@@ -117,13 +123,14 @@ def modify_event(event_id: int, event_data: EventUpdate, db: Session = Depends(g
     updated_event = update_event(db, event_id, event_data)
     if not updated_event:
         raise HTTPException(status_code=404, detail="Event not found")
+    clear_feed_cache()
 
     return EventResponse.from_orm(updated_event)
 
 
 @router.delete("/delete/{event_id}", response_model=dict)
 def remove_event(event_id: int, db: Session = Depends(get_db),
-                 current_user: TokenData = Depends(get_current_user)
+                 current_user: CurrentUser = Depends(get_current_user)
                  ):
     """
       Delete event by ID / Eliminar evento por ID
@@ -145,11 +152,12 @@ def remove_event(event_id: int, db: Session = Depends(get_db),
 
     if not delete_event(db, event_id):
         raise HTTPException(status_code=404, detail="Event not found")
+    clear_feed_cache()
     return {"message": "Event deleted successfully"}
 
 @router.get("/next", response_model=NextEventPublicResponse)
 def get_next_event_public(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     include_image: bool = True
 ):
     """
@@ -186,7 +194,7 @@ def get_next_event_public(
     return NextEventPublicResponse.from_orm(event)
 
 @router.get("/public_upcoming", response_model=List[EventResponse])
-def get_public_upcoming_events(db: Session = Depends(get_db)):
+def get_public_upcoming_events(db: Session = Depends(get_read_db)):
     """
     Get upcoming public events (unauthenticated users).
 
@@ -216,4 +224,4 @@ def get_public_upcoming_events(db: Session = Depends(get_db)):
         .all()
     )
 
-    return [EventResponse.from_orm(ev) for ev in eventos]
+    return PrevalidatedResponse([EventResponse.from_orm(ev) for ev in eventos])
@@ -2,17 +2,20 @@ from typing import List
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.core.security import get_current_user
+from app.core.responses import PrevalidatedResponse
+from app.core.security import get_current_user, get_token_user, require_role
 from app.crud import event_participant as crud_part
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.models.domain.event import Event
 from app.models.domain.event_participant import EventParticipant
 from app.models.domain.user import User, Role
 from app.models.schema.event_participant import EventParticipantCreate, ParticipantsResponse
 from app.models.schema.persona import PersonaResponse
-from app.models.schema.user import UserBasicResponse
+from app.models.schema.user import UserBasicResponse, CurrentUser
+from app.services.feed_service import invalidate_user_feed
+from app.services.profiling import ProfiledRoute
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 ALL_AUTH_ROLES = [Role.ADMIN, Role.NORMAL]
 
 
@@ -20,7 +23,7 @@ ALL_AUTH_ROLES = [Role.ADMIN, Role.NORMAL]
 def register_user_to_event(
         participation: EventParticipantCreate,
         db: Session = Depends(get_db),
-        current_user: User = Depends(get_current_user)
+        current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Register User to Event / Inscribir Usuario a un Evento
@@ -69,13 +72,14 @@ def register_user_to_event(
         )
 
     crud_part.create_participation(db, user_id=current_user.id, participation=participation)
+    invalidate_user_feed(current_user.id)
 
     return {"detail": "Te has inscrito correctamente en el evento"}
 
 
 @router.get("/event/{event_id}", response_model=List[ParticipantsResponse])
-def get_participants(event_id: int, db: Session = Depends(get_db),
-                     current_user: User = Depends(get_current_user)):
+def get_participants(event_id: int, db: Session = Depends(get_read_db),
+                     current_user: CurrentUser = Depends(require_role(Role.ADMIN))):
 
     """
     Get Event Participants / Obtener Participantes del Evento
@@ -96,8 +100,6 @@ def get_participants(event_id: int, db: Session = Depends(get_db),
 
 
     """
-    if current_user.role.value not in Role.ADMIN:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
     participants = (
         db.query(EventParticipant)
         .join(EventParticipant.user)
@@ -120,14 +122,14 @@ def get_participants(event_id: int, db: Session = Depends(get_db),
             )
         )
 
-    return response
+    return PrevalidatedResponse(response)
 
 
 @router.delete("/unregister_event/{event_id}")
 def unregister_user_from_event(
         event_id: int,
         db: Session = Depends(get_db),
-        current_user: User = Depends(get_current_user)
+        current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Unregister from Event / Cancelar Inscripción en un Evento
@@ -163,13 +165,14 @@ def unregister_user_from_event(
     deleted = crud_part.delete_participation(db, user_id=current_user.id, event_id=event_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="No estás inscrito en este evento")
+    invalidate_user_feed(current_user.id)
 
     return {"detail": "Te has desenrolado del evento correctamente"}
 
 @router.get("/my_events", response_model=List[int])
 def get_my_registered_events(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: CurrentUser = Depends(get_token_user)
 ):
     """
     Get My Registered Events / Obtener mis eventos inscritos
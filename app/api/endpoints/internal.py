@@ -0,0 +1,121 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import FileResponse, PlainTextResponse
+
+from app.core.security import require_role
+from app.db.async_session import async_engine
+from app.db.database import engine
+from app.db.pool import get_pool_status
+from app.db.slow_query_log import slow_query_log, SLOW_QUERY_THRESHOLD_MS
+from app.models.domain.user import Role
+from app.models.schema.user import CurrentUser
+from app.services.profiling import ProfiledRoute, list_profiles, get_profile_path
+
+router = APIRouter(route_class=ProfiledRoute)
+
+
+@router.get("/db/pool")
+def get_db_pool_status(current_user: CurrentUser = Depends(require_role(Role.ADMIN))):
+    """
+    Get Database Pool Status / Obtener Estado del Pool de Conexiones
+
+    English:
+    --------
+    Returns the current state of the database connection pool (size, checked-in and checked-out
+    connections, overflow) and the accumulated number of checkouts that had to wait for a free
+    connection, how long they waited and how many timed out. The pool of the async engine is
+    reported under **async_pool**.
+
+    - Only administrators can access this endpoint.
+
+    Español:
+    --------
+    Devuelve el estado actual del pool de conexiones de la base de datos (tamaño, conexiones libres
+    y en uso, overflow) y el número acumulado de solicitudes que tuvieron que esperar por una
+    conexión libre, cuánto esperaron y cuántas agotaron el tiempo de espera. El pool del motor
+    asíncrono se devuelve en **async_pool**.
+
+    - Solo los administradores pueden acceder a este endpoint.
+    """
+    status = get_pool_status(engine)
+    status["async_pool"] = get_pool_status(async_engine.sync_engine)
+    return status
+
+
+@router.get("/db/slow_queries")
+def get_slow_queries(limit: int = Query(20, ge=1, le=200),
+                     order_by: Literal["max_ms", "total_ms", "avg_ms", "count"] = "max_ms",
+                     current_user: CurrentUser = Depends(require_role(Role.ADMIN))):
+    """
+    Get Slow Queries / Obtener Consultas Lentas
+
+    English:
+    --------
+    Returns the slowest SQL statements since the process started, grouped by fingerprint (the
+    statement without values). Each entry includes the number of executions over the threshold,
+    the maximum, average and total duration in milliseconds, the last row count, the types of
+    the last bound parameters and the application functions that issued it.
+
+    - **limit** (int, optional): Number of fingerprints to return. Defaults to 20.
+    - **order_by** (optional): **max_ms** (default), **total_ms**, **avg_ms** or **count**.
+    - Only administrators can access this endpoint.
+
+    Español:
+    --------
+    Devuelve las sentencias SQL más lentas desde que inició el proceso, agrupadas por su forma
+    (la sentencia sin valores). Cada entrada incluye cuántas veces superó el umbral, la duración
+    máxima, promedio y total en milisegundos, el último número de filas, los tipos de los últimos
+    parámetros y las funciones de la aplicación que la ejecutaron.
+
+    - **limit** (int, opcional): Número de consultas a devolver. Por defecto 20.
+    - **order_by** (opcional): **max_ms** (por defecto), **total_ms**, **avg_ms** o **count**.
+    - Solo los administradores pueden acceder a este endpoint.
+    """
+    return {
+        "threshold_ms": SLOW_QUERY_THRESHOLD_MS,
+        "queries": slow_query_log.top(limit, order_by),
+    }
+
+
+@router.get("/profiles")
+def get_profiles(current_user: CurrentUser = Depends(require_role(Role.ADMIN))):
+    """
+    List Request Profiles / Listar Perfiles de Peticiones
+
+    English:
+    --------
+    Lists the saved request profiles, newest first. A profile is recorded when an administrator
+    sends a request with the header **X-Profile: 1** (or the query parameter **profile=1**);
+    its id is returned in the **X-Profile-Id** response header.
+
+    Español:
+    --------
+    Lista los perfiles de peticiones guardados, del más reciente al más antiguo. Un perfil se
+    registra cuando un administrador envía una petición con el encabezado **X-Profile: 1**
+    (o el parámetro **profile=1**); su id se devuelve en el encabezado **X-Profile-Id**.
+    """
+    return list_profiles()
+
+
+@router.get("/profiles/{profile_id}")
+def get_profile(profile_id: str,
+                format: Literal["text", "pstats"] = "text",
+                current_user: CurrentUser = Depends(require_role(Role.ADMIN))):
+    """
+    Get Request Profile / Obtener Perfil de una Petición
+
+    English:
+    --------
+    - **format** (optional): **text** (default) returns the functions with the highest cumulative
+      time; **pstats** downloads the raw profile, which can be opened with pstats or snakeviz.
+
+    Español:
+    --------
+    - **format** (opcional): **text** (por defecto) devuelve las funciones con mayor tiempo
+      acumulado; **pstats** descarga el perfil completo, que se abre con pstats o snakeviz.
+    """
+    if format == "pstats":
+        return FileResponse(get_profile_path(profile_id, "prof"), media_type="application/octet-stream",
+                            filename=f"{profile_id}.prof")
+    return PlainTextResponse(get_profile_path(profile_id, "txt").read_text(encoding="utf-8"))
@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.core.responses import PrevalidatedResponse
+from app.core.security import require_role
+from app.db.session import get_read_db
+from app.models.domain.user import Role
+from app.models.schema.feed import FeedResponse
+from app.models.schema.user import CurrentUser
+from app.services.feed_service import get_user_feed
+from app.services.profiling import ProfiledRoute
+
+router = APIRouter(route_class=ProfiledRoute)
+
+
+@router.get("/feed", response_model=FeedResponse)
+def get_my_feed(
+        include_image: bool = False,
+        db: Session = Depends(get_read_db),
+        current_user: CurrentUser = Depends(require_role(Role.ADMIN, Role.NORMAL))
+):
+    """
+    Get My Feed / Obtener mi Feed
+
+    English:
+    --------
+    Returns the upcoming events together with the registration status of the current user,
+    the number of participants of each event and the number of unread notifications.
+
+    - Requires authentication.
+    - **include_image** (bool, optional): Whether to include event images. Defaults to False.
+
+    Español:
+    --------
+    Devuelve los próximos eventos junto con el estado de inscripción del usuario actual,
+    el número de participantes de cada evento y el número de notificaciones sin leer.
+
+    - Requiere autenticación.
+    - **include_image** (bool, opcional): Si se deben incluir las imágenes de los eventos. Por defecto es False.
+    """
+    return PrevalidatedResponse(get_user_feed(db, current_user.id, include_image=include_image))
@@ -0,0 +1,27 @@
+import hmac
+import os
+
+from dotenv import load_dotenv
+from fastapi import APIRouter, Header, HTTPException, Response
+from typing import Optional
+
+from app.services.metrics import render_metrics
+
+load_dotenv()
+
+# Si se define, Prometheus debe enviar "Authorization: Bearer <METRICS_TOKEN>"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics(authorization: Optional[str] = Header(None)):
+    """
+    Métricas de la aplicación en formato de texto de Prometheus.
+    """
+    if METRICS_TOKEN and not hmac.compare_digest(authorization or "", f"Bearer {METRICS_TOKEN}"):
+        raise HTTPException(status_code=401, detail="No autorizado")
+
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
@@ -1,25 +1,89 @@
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.security import get_current_user
-from app.crud.notification import get_user_notifications, mark_notification_as_read
+from app.core.responses import PrevalidatedResponse
+from app.core.security import get_current_user, get_current_user_async, get_token_user
+from app.crud.aio import notification as notification_aio
+from app.crud.notification_preference import get_or_create_preference, update_preference
+from app.db.async_session import get_async_db
 from app.db.session import get_db
-from app.models.domain.user import User
 from app.models.schema.notification import NotificationResponse
+from app.models.schema.notification_preference import NotificationPreferenceResponse, NotificationPreferenceUpdate
+from app.models.schema.user import CurrentUser
+from app.services.feed_service import invalidate_user_feed
+from app.services.profiling import ProfiledRoute
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.get("/", response_model=List[NotificationResponse])
-def get_notifications(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    return get_user_notifications(db, current_user.id)
+async def get_notifications(db: AsyncSession = Depends(get_async_db),
+                            current_user: CurrentUser = Depends(get_token_user)):
+    notifications = await notification_aio.get_user_notifications(db, current_user.id)
+    return PrevalidatedResponse([NotificationResponse.model_validate(noti) for noti in notifications])
 
 
 @router.patch("/mark_as_read/{notification_id}", response_model=NotificationResponse)
-def mark_as_read(notification_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    noti = mark_notification_as_read(db, notification_id, current_user.id)
+async def mark_as_read(notification_id: int, db: AsyncSession = Depends(get_async_db),
+                       current_user: CurrentUser = Depends(get_current_user_async)):
+    noti = await notification_aio.mark_notification_as_read(db, notification_id, current_user.id)
     if not noti:
         raise HTTPException(status_code=404, detail="Notificación no encontrada")
+    invalidate_user_feed(current_user.id)
     return noti
+
+
+@router.get("/preferences", response_model=NotificationPreferenceResponse)
+def get_notification_preferences(db: Session = Depends(get_db),
+                                 current_user: CurrentUser = Depends(get_token_user)):
+    """
+    Get My Notification Preferences / Obtener mis Preferencias de Notificación
+
+    English:
+    --------
+    Returns the notification preferences of the current user.
+
+    Español:
+    --------
+    Devuelve las preferencias de notificación del usuario actual.
+    """
+    return NotificationPreferenceResponse.from_orm_custom(get_or_create_preference(db, current_user.id))
+
+
+@router.put("/preferences", response_model=NotificationPreferenceResponse)
+def update_notification_preferences(preference_data: NotificationPreferenceUpdate,
+                                    db: Session = Depends(get_db),
+                                    current_user: CurrentUser = Depends(get_current_user)):
+    """
+    Update My Notification Preferences / Actualizar mis Preferencias de Notificación
+
+    English:
+    --------
+    - **digest_frequency** (optional): Email digest of unread notifications. Must be one of:
+        - **Ninguno**: No digest (default).
+        - **Diario**: Daily digest.
+        - **Semanal**: Weekly digest.
+    - **event_types** (optional): Event types to be notified about (Entrenamiento, Rodada).
+    - **event_modes** (optional): Event modes to be notified about (Montaña, Carretera).
+    - **event_levels** (optional): Event levels to be notified about (Básico, Intermedio, Avanzado).
+    - **channels** (optional): Delivery channels (App, Correo).
+
+    Each list replaces the previous selection of that category.
+
+    Español:
+    --------
+    - **digest_frequency** (opcional): Resumen por correo de las notificaciones sin leer. Debe ser uno de:
+        - **Ninguno**: Sin resumen (por defecto).
+        - **Diario**: Resumen diario.
+        - **Semanal**: Resumen semanal.
+    - **event_types** (opcional): Tipos de evento de los que se desea ser notificado (Entrenamiento, Rodada).
+    - **event_modes** (opcional): Modalidades de evento (Montaña, Carretera).
+    - **event_levels** (opcional): Niveles de evento (Básico, Intermedio, Avanzado).
+    - **channels** (opcional): Canales de entrega (App, Correo).
+
+    Cada lista reemplaza la selección anterior de esa categoría.
+    """
+    return NotificationPreferenceResponse.from_orm_custom(update_preference(db, current_user.id, preference_data))
@@ -3,19 +3,21 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from app.core.security import get_current_user
+from app.core.responses import PrevalidatedResponse
+from app.core.security import get_current_user, require_role
 from app.crud.route import create_route, get_routes, update_route, delete_route
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.models.domain.user import Role
 from app.models.schema.route import RouteCreate, RouteResponse, RouteUpdate
-from app.models.schema.user import TokenData
+from app.models.schema.user import CurrentUser
+from app.services.profiling import ProfiledRoute
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.post("/create", response_model=RouteResponse)
 def create_route_endpoint(route_data: RouteCreate, db: Session = Depends(get_db),
-                          current_user: TokenData = Depends(get_current_user)
+                          current_user: CurrentUser = Depends(get_current_user)
                           ):
     """
     Create a New Route / Crear una Nueva Ruta
@@ -49,8 +51,8 @@ def create_route_endpoint(route_data: RouteCreate, db: Session = Depends(get_db)
 
 
 @router.get("/", response_model=List[RouteResponse])
-def get_routes_all(db: Session = Depends(get_db),
-                   current_user: TokenData = Depends(get_current_user)
+def get_routes_all(db: Session = Depends(get_read_db),
+                   current_user: CurrentUser = Depends(require_role(Role.ADMIN))
                    ):
     """
         Get All Routes / Obtener todas las rutas
@@ -63,14 +65,12 @@ def get_routes_all(db: Session = Depends(get_db),
         --------
         Recuperar todas las rutas de ciclismo registradas.
         """
-    if current_user.role.value not in [Role.ADMIN]:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
     routes = get_routes(db)
-    return routes
+    return PrevalidatedResponse([RouteResponse.model_validate(route) for route in routes])
 
 @router.delete("/delete/{route_id}", response_model=RouteResponse)
 def delete_route_endpoint(route_id: int, db: Session = Depends(get_db),
-                          current_user: TokenData = Depends(get_current_user)):
+                          current_user: CurrentUser = Depends(get_current_user)):
     """
        Delete Route by ID / Eliminar ruta por ID
 
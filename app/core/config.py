@@ -1,3 +1,8 @@
+from typing import Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
 class Settings:
     ADMIN_PASSWORD = "SecurePassword123@"
     ADMIN_FIRST_NAME = "David"
@@ -9,4 +14,68 @@ class Settings:
     ADMIN_BLOOD_TYPE = "O+"
     ADMIN_SKILL_LEVEL = "Alto"
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
+
+
+class DatabaseSettings(BaseSettings):
+    """
+    Configuración de la base de datos y del pool de conexiones.
+    Se lee de las variables de entorno con prefijo DATABASE_ (p. ej. DATABASE_POOL_SIZE).
+    """
+    model_config = SettingsConfigDict(env_prefix="DATABASE_", env_file=".env", extra="ignore")
+
+    user: Optional[str] = None
+    password: Optional[str] = None
+    host: Optional[str] = None
+    name: Optional[str] = None
+    # Si se define, reemplaza a user/password/host/name (p. ej. sqlite:///./local.db)
+    url: Optional[str] = None
+    # URL del motor asíncrono; si no se define se deriva de la URL síncrona
+    # (mysql+pymysql -> mysql+aiomysql, sqlite -> sqlite+aiosqlite)
+    async_url: Optional[str] = None
+
+    # No registrar cada sentencia SQL salvo que se pida explícitamente
+    echo: bool = False
+    pool_size: int = 10
+    max_overflow: int = 20
+    # Segundos de espera por una conexión libre antes de fallar
+    pool_timeout: int = 30
+    # Reciclar conexiones antes del wait_timeout de MySQL (8 horas por defecto)
+    pool_recycle: int = 1800
+    # Comprobar la conexión al tomarla del pool para descartar las que cerró el servidor
+    pool_pre_ping: bool = True
+    connect_timeout: int = 10
+
+    # Trabajo de esquema al iniciar cada worker:
+    #   "create_all": crea las tablas y el administrador (desarrollo local)
+    #   "none": no toca el esquema; se usa `python -m app.manage migrate` en cada despliegue
+    startup_schema: str = "create_all"
+
+    # Réplicas de solo lectura separadas por comas (DATABASE_REPLICA_URLS)
+    replica_urls: Optional[str] = None
+    # Segundos que un cliente sigue leyendo del primario después de escribir
+    replica_sticky_seconds: int = 5
+
+    @property
+    def sqlalchemy_url(self) -> str:
+        if self.url:
+            return self.url
+        return f"mysql+pymysql://{self.user}:{self.password}@{self.host}/{self.name}"
+
+    @property
+    def replica_url_list(self) -> list[str]:
+        if not self.replica_urls:
+            return []
+        return [url.strip() for url in self.replica_urls.split(",") if url.strip()]
+
+    @property
+    def sqlalchemy_async_url(self) -> str:
+        if self.async_url:
+            return self.async_url
+        scheme, rest = self.sqlalchemy_url.split("://", 1)
+        dialect = scheme.split("+")[0]
+        drivers = {"mysql": "mysql+aiomysql", "sqlite": "sqlite+aiosqlite"}
+        return f"{drivers.get(dialect, scheme)}://{rest}"
+
+
+database_settings = DatabaseSettings()
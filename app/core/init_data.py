@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session
-from app.models.domain.user import User
+from app.models.domain.user import User, Role
 from app.models.domain.persona import Persona
 from app.models.schema.user import UserCreate
 from app.models.schema.persona import PersonaCreate
@@ -12,7 +12,7 @@ def create_admin_user():
     db = SessionLocal()
     try:
         # Verificar si ya existe un administrador
-        admin = db.query(User).filter(User.role == "admin").first()
+        admin = db.query(User).filter(User.role == Role.ADMIN).first()
         if not admin:
             # Crear los datos del usuario administrador, incluyendo la persona
             user_data = UserCreate(
@@ -0,0 +1,28 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
+
+
+def _dump(content: Any) -> Any:
+    # model_dump en modo Python es más rápido que en modo JSON: orjson ya
+    # serializa datetime, enums y UUID sin pasar por jsonable_encoder
+    if isinstance(content, BaseModel):
+        return content.model_dump()
+    if isinstance(content, (list, tuple)):
+        return [_dump(item) for item in content]
+    return content
+
+
+class PrevalidatedResponse(ORJSONResponse):
+    """
+    Respuesta para modelos que el endpoint ya construyó y validó (por ejemplo con
+    los `from_orm` de los esquemas). Al devolver una Response, FastAPI no vuelve a
+    validar el contenido contra `response_model` ni usa jsonable_encoder;
+    `response_model` se mantiene en el decorador solo para la documentación OpenAPI.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(_dump(content), default=to_jsonable_python)
@@ -1,5 +1,6 @@
 # app/core/security.py
 import os
+import uuid
 from datetime import datetime, timedelta
 from fastapi import Header
 
@@ -7,9 +8,17 @@ from dotenv import load_dotenv
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.crud.aio.user import get_user_by_email as get_user_async
+from app.crud.refresh_token import (
+    create_refresh_token_record, get_refresh_token_by_jti, revoke_user_refresh_tokens
+)
+from app.db.async_session import get_async_db
 from app.db.session import get_db
-from app.models.domain.user import User
+from app.models.domain.user import User, Role
+from app.models.schema.user import CurrentUser
+from app.services.cache import TTLCache
 from typing import Optional
 
 load_dotenv()
@@ -17,9 +26,17 @@ load_dotenv()
 # Configuración del token
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
+# El token de acceso lleva el rol en sus claims y se acepta sin consultar la base de datos,
+# por eso vive poco; la sesión se mantiene renovándolo con el refresh token
+ACCESS_TOKEN_TTL_MINUTES = int(os.getenv("ACCESS_TOKEN_TTL_MINUTES", "15"))
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
+# Caché de usuarios autenticados (id, rol y persona) indexada por email
+IDENTITY_CACHE_TTL_SECONDS = int(os.getenv("IDENTITY_CACHE_TTL_SECONDS", "60"))
+IDENTITY_CACHE_MAXSIZE = int(os.getenv("IDENTITY_CACHE_MAXSIZE", "4096"))
+identity_cache = TTLCache(maxsize=IDENTITY_CACHE_MAXSIZE, ttl=IDENTITY_CACHE_TTL_SECONDS)
+
 
 
 def get_token_from_header(authorization: str = Header(...)) -> str:
@@ -33,39 +50,167 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_TTL_MINUTES)
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
+# Claims del token de acceso: permiten autorizar lecturas sin consultar la base de datos
+def build_access_token_claims(user: User) -> dict:
+    return {
+        "sub": user.email,
+        "uid": user.id,
+        "role": user.role.value,
+        "pid": user.person_id,
+        "type": "access",
+    }
+
+
+# Crear y registrar un token de actualización (refresh token)
+def issue_refresh_token(db: Session, user_id: int) -> str:
+    jti = uuid.uuid4().hex
+    expire = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    create_refresh_token_record(db, user_id=user_id, jti=jti, date_expiration=expire)
+    return jwt.encode(
+        {"sub": str(user_id), "jti": jti, "type": "refresh", "exp": expire},
+        SECRET_KEY,
+        algorithm=ALGORITHM,
+    )
+
+
+# Rotar un refresh token: se revoca el actual y se emite uno nuevo
+def rotate_refresh_token(db: Session, refresh_token: str):
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Refresh token inválido o expirado",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    payload = decode_token(refresh_token, credentials_exception)
+    if payload.get("type") != "refresh":
+        raise credentials_exception
+
+    db_token = get_refresh_token_by_jti(db, payload.get("jti"))
+    if db_token is None or db_token.date_expiration < datetime.utcnow():
+        raise credentials_exception
+
+    if db_token.is_revoked:
+        # Un token ya rotado se volvió a usar: se revocan todas las sesiones del usuario
+        revoke_user_refresh_tokens(db, db_token.user_id)
+        raise credentials_exception
+
+    user = db.query(User).filter(User.id == db_token.user_id).first()
+    if user is None:
+        raise credentials_exception
+
+    db_token.is_revoked = True
+    new_refresh_token = issue_refresh_token(db, user.id)
+    return user, new_refresh_token
+
+
 # Obtener el usuario desde la base de datos
 def get_user(db: Session, email: str) -> User:
     return db.query(User).filter(User.email == email).first()
 
 
 
-# Verificar el token de acceso
-def verify_access_token(token: str, credentials_exception):
+# Decodificar un token JWT
+def decode_token(token: str, credentials_exception) -> dict:
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")  # Cambiado 'username' por 'email'
-        if email is None:
-            raise credentials_exception
-        return email
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except JWTError:
         raise credentials_exception
 
 
+# Verificar el token de acceso
+def verify_access_token(token: str, credentials_exception):
+    payload = decode_token(token, credentials_exception)
+    if payload.get("type") == "refresh":
+        raise credentials_exception
+    email: str = payload.get("sub")  # Cambiado 'username' por 'email'
+    if email is None:
+        raise credentials_exception
+    return email
+
+
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> CurrentUser:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     email = verify_access_token(token, credentials_exception)
-    user = get_user(db, email=email)
-    if user is None:
+
+    # Solo se consulta la base de datos si el usuario no está en caché
+    current_user = identity_cache.get(email)
+    if current_user is None:
+        user = get_user(db, email=email)
+        if user is None:
+            raise credentials_exception
+        current_user = CurrentUser.from_orm_custom(user)
+        identity_cache.set(email, current_user)
+    return current_user
+
+
+# Versión async de get_current_user para endpoints que usan la sesión asíncrona
+async def get_current_user_async(token: str = Depends(oauth2_scheme),
+                                 db: AsyncSession = Depends(get_async_db)) -> CurrentUser:
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    email = verify_access_token(token, credentials_exception)
+
+    current_user = identity_cache.get(email)
+    if current_user is None:
+        user = await get_user_async(db, email=email)
+        if user is None:
+            raise credentials_exception
+        current_user = CurrentUser.from_orm_custom(user)
+        identity_cache.set(email, current_user)
+    return current_user
+
+
+# Elimina de la caché al usuario cuando cambian su rol, su contraseña o se elimina
+def invalidate_current_user(email: str):
+    identity_cache.pop(email)
+
+
+# Obtener el usuario directamente de los claims del token, sin consultar la base de datos
+def get_token_user(token: str = Depends(oauth2_scheme)) -> CurrentUser:
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    payload = decode_token(token, credentials_exception)
+    if payload.get("type") != "access":
         raise credentials_exception
-    return user
\ No newline at end of file
+
+    try:
+        return CurrentUser(
+            id=payload["uid"],
+            email=payload["sub"],
+            role=payload["role"],
+            person_id=payload["pid"],
+        )
+    except (KeyError, ValueError):
+        raise credentials_exception
+
+
+# Dependencia que valida el rol desde el token; pensada para endpoints de solo lectura.
+# Los endpoints solo para administradores (datos personales, operación) confirman el rol
+# actual con identity_cache/base de datos: un administrador degradado o eliminado pierde
+# el acceso de inmediato y no cuando expira su token
+def require_role(*roles: Role):
+    allowed_roles = [role.value for role in roles]
+    user_dependency = get_current_user if set(roles) == {Role.ADMIN} else get_token_user
+
+    def dependency(current_user: CurrentUser = Depends(user_dependency)) -> CurrentUser:
+        if current_user.role.value not in allowed_roles:
+            raise HTTPException(status_code=403, detail="Not enough permissions")
+        return current_user
+
+    return dependency
@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, defer
+
+from app.models.domain.event import Event
+
+
+async def get_events(db: AsyncSession):
+    # 🔄 Actualiza en la base de datos los eventos ya pasados
+    await db.execute(
+        update(Event)
+        .where(Event.creation_date < datetime.now(), Event.is_available == True)
+        .values(is_available=False)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+    # 🔁 Devuelve todos los eventos (con rutas)
+    result = await db.execute(
+        select(Event).options(joinedload(Event.route)).order_by(Event.creation_date.desc())
+    )
+    return result.scalars().all()
+
+
+async def get_upcoming_events(db: AsyncSession, include_image: bool = True):
+    query = (
+        select(Event)
+        .options(joinedload(Event.route))
+        .where(Event.creation_date >= datetime.now())
+        .order_by(Event.creation_date.asc())
+    )
+    if not include_image:
+        # Evita traer los bytes de la imagen cuando no se van a enviar
+        query = query.options(defer(Event.image))
+    result = await db.execute(query)
+    return result.scalars().all()
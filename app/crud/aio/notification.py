@@ -0,0 +1,35 @@
+from sqlalchemy import select, desc, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.domain.notification import Notification
+
+
+async def get_user_notifications(db: AsyncSession, user_id: int):
+    result = await db.execute(
+        select(Notification)
+        .where(Notification.user_id == user_id)
+        .order_by(desc(Notification.created_at))
+    )
+    return result.scalars().all()
+
+
+async def count_unread_notifications(db: AsyncSession, user_id: int) -> int:
+    result = await db.execute(
+        select(func.count(Notification.id))
+        .where(Notification.user_id == user_id, Notification.is_read == False)
+    )
+    return result.scalar_one()
+
+
+async def mark_notification_as_read(db: AsyncSession, notification_id: int, user_id: int):
+    result = await db.execute(
+        select(Notification)
+        .where(Notification.id == notification_id, Notification.user_id == user_id)
+    )
+    noti = result.scalar_one_or_none()
+    if not noti:
+        return None
+
+    noti.is_read = True
+    await db.commit()
+    return noti
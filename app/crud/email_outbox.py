@@ -0,0 +1,75 @@
+import json
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_, and_
+from sqlalchemy.orm import Session
+
+from app.models.domain.email_outbox import EmailOutbox, EmailStatus
+
+
+def enqueue_email(db: Session, recipient: str, subject: str, template: str, context: dict,
+                  commit: bool = True) -> EmailOutbox:
+    email = EmailOutbox(
+        recipient=recipient,
+        subject=subject,
+        template=template,
+        context=json.dumps(context, default=str),
+        status=EmailStatus.PENDING,
+        attempts=0,
+        next_attempt_at=datetime.utcnow()
+    )
+    db.add(email)
+    if commit:
+        db.commit()
+    return email
+
+
+def claim_email_batch(db: Session, batch_size: int, stale_after_seconds: int) -> list[EmailOutbox]:
+    """
+    Reserva un lote de correos pendientes. También recupera los que quedaron en
+    estado "sending" si el worker que los tomó se detuvo.
+    """
+    now = datetime.utcnow()
+    stale_limit = now - timedelta(seconds=stale_after_seconds)
+
+    emails = (
+        db.query(EmailOutbox)
+        .filter(
+            or_(
+                and_(EmailOutbox.status == EmailStatus.PENDING, EmailOutbox.next_attempt_at <= now),
+                and_(EmailOutbox.status == EmailStatus.SENDING, EmailOutbox.claimed_at < stale_limit),
+            )
+        )
+        .order_by(EmailOutbox.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+
+    for email in emails:
+        email.status = EmailStatus.SENDING
+        email.claimed_at = now
+    db.commit()
+    return emails
+
+
+def mark_email_sent(db: Session, email: EmailOutbox):
+    email.status = EmailStatus.SENT
+    email.sent_at = datetime.utcnow()
+    email.attempts += 1
+    email.last_error = None
+    db.commit()
+    return email
+
+
+def mark_email_failed(db: Session, email: EmailOutbox, error: str, max_attempts: int, retry_seconds: int):
+    email.attempts += 1
+    email.last_error = error[:2000]
+    if email.attempts >= max_attempts:
+        email.status = EmailStatus.FAILED
+    else:
+        # Backoff exponencial: retry_seconds, 2x, 4x, ...
+        email.status = EmailStatus.PENDING
+        email.next_attempt_at = datetime.utcnow() + timedelta(seconds=retry_seconds * 2 ** (email.attempts - 1))
+    db.commit()
+    return email
@@ -1,13 +1,15 @@
 import base64
 import locale
 from datetime import datetime
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, defer
 
-from app.crud.notification import create_notification
+from app.crud.email_outbox import enqueue_email
+from app.crud.notification import create_notifications_bulk
+from app.crud.notification_preference import get_event_notification_recipients
 from app.models.domain.event import Event
 from app.models.domain.event_participant import EventParticipant
-from app.models.domain.user import User
 from app.models.schema.event import EventCreate, EventUpdate, EventResponse
+from app.services.email_service import get_notification_template
 from app.services.verify import verify_image_size
 
 locale.setlocale(locale.LC_TIME, "es_ES.UTF-8")
@@ -37,14 +39,31 @@ def create_event(db: Session, event_data: EventCreate) -> EventResponse:
 
     nombre_ruta = db_event.route.name if db_event.route else "Ruta sin nombre"
 
-    normal_users = db.query(User).filter(User.role == "Normal").all()
-    for user in normal_users:
-        create_notification(
-            db,
-            user_id=user.id,
-            title="¡Nuevo evento disponible!",
-            message=f"Se ha creado el evento {db_event.event_type.value} {nombre_ruta} para el día {fecha_formateada}. ¡Inscríbete ahora!"
-        )
+    titulo = "¡Nuevo evento disponible!"
+    mensaje = f"Se ha creado el evento {db_event.event_type.value} {nombre_ruta} para el día {fecha_formateada}. ¡Inscríbete ahora!"
+
+    # Solo se notifica a los usuarios interesados, por los canales que eligieron
+    destinatarios = get_event_notification_recipients(db, db_event)
+    create_notifications_bulk(
+        db,
+        user_ids=[d.user_id for d in destinatarios if d.channel_in_app],
+        title=titulo,
+        message=mensaje,
+        commit=False
+    )
+
+    plantilla = get_notification_template("event_created")
+    for destinatario in destinatarios:
+        if destinatario.channel_email:
+            enqueue_email(
+                db,
+                destinatario.email,
+                titulo,
+                plantilla,
+                {"body": {"title": "Club de Ciclismo EPN", "notification_title": titulo, "message": mensaje}},
+                commit=False
+            )
+    db.commit()
 
     return EventResponse.from_orm(db_event)
 
@@ -58,6 +77,18 @@ def get_events(db: Session):
     # 🔁 Devuelve todos los eventos (con rutas)
     return db.query(Event).options(joinedload(Event.route)).order_by(Event.creation_date.desc()).all()
 
+def get_upcoming_events(db: Session, include_image: bool = True):
+    query = (
+        db.query(Event)
+        .options(joinedload(Event.route))
+        .filter(Event.creation_date >= datetime.now())
+        .order_by(Event.creation_date.asc())
+    )
+    if not include_image:
+        # Evita traer los bytes de la imagen cuando no se van a enviar
+        query = query.options(defer(Event.image))
+    return query.all()
+
 def update_event(db: Session, event_id: int, event_data: EventUpdate):
     db_event = db.query(Event).filter(Event.id == event_id).first()
     if not db_event:
@@ -94,16 +125,15 @@ def update_event(db: Session, event_id: int, event_data: EventUpdate):
     resto_fecha = db_event.creation_date.strftime("%d de %B del %Y")
     fecha_formateada = f"{dia_semana} {resto_fecha}"
 
-    inscritos = db.query(EventParticipant).filter(EventParticipant.event_id == event_id).all()
+    inscritos = db.query(EventParticipant.user_id).filter(EventParticipant.event_id == event_id).all()
     nombre_ruta = db_event.route.name if db_event.route else "Ruta sin nombre"
 
-    for ins in inscritos:
-        create_notification(
-            db,
-            user_id=ins.user_id,
-            title="Evento actualizado",
-            message=f"El evento {db_event.event_type.value} {nombre_ruta} del día {fecha_formateada} ha sido actualizado. Revisa los nuevos detalles en la plataforma."
-        )
+    create_notifications_bulk(
+        db,
+        user_ids=[ins.user_id for ins in inscritos],
+        title="Evento actualizado",
+        message=f"El evento {db_event.event_type.value} {nombre_ruta} del día {fecha_formateada} ha sido actualizado. Revisa los nuevos detalles en la plataforma."
+    )
 
     return db_event
 
@@ -124,16 +154,16 @@ def delete_event(db: Session, event_id: int):
     resto_fecha = db_event.creation_date.strftime("%d de %B del %Y")
     fecha_formateada = f"{dia_semana} {resto_fecha}"
 
-    inscritos = db.query(EventParticipant).filter(EventParticipant.event_id == event_id).all()
+    inscritos = db.query(EventParticipant.user_id).filter(EventParticipant.event_id == event_id).all()
     nombre_ruta = db_event.route.name if db_event.route else "Ruta sin nombre"
 
-    for ins in inscritos:
-        create_notification(
-            db,
-            user_id=ins.user_id,
-            title="Evento cancelado",
-            message=f'El evento "{db_event.event_type.value} {nombre_ruta}" del día {fecha_formateada} ha sido cancelado. Lamentamos los inconvenientes.'
-        )
+    create_notifications_bulk(
+        db,
+        user_ids=[ins.user_id for ins in inscritos],
+        title="Evento cancelado",
+        message=f'El evento "{db_event.event_type.value} {nombre_ruta}" del día {fecha_formateada} ha sido cancelado. Lamentamos los inconvenientes.',
+        commit=False
+    )
 
     db.delete(db_event)
     db.commit()
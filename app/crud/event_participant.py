@@ -1,4 +1,5 @@
 import pytz
+from sqlalchemy import func
 from sqlalchemy.orm import Session, selectinload
 from app.models.domain.event_participant import EventParticipant
 from app.models.domain.user import User
@@ -45,3 +46,23 @@ def delete_participation(db: Session, user_id: int, event_id: int):
     db.delete(participation)
     db.commit()
     return participation
+
+def count_participants_by_event(db: Session, event_ids: list[int]) -> dict[int, int]:
+    if not event_ids:
+        return {}
+
+    rows = (
+        db.query(EventParticipant.event_id, func.count(EventParticipant.id))
+        .filter(EventParticipant.event_id.in_(event_ids))
+        .group_by(EventParticipant.event_id)
+        .all()
+    )
+    return {event_id: total for event_id, total in rows}
+
+def get_registered_event_ids(db: Session, user_id: int, event_ids: list[int] = None) -> set[int]:
+    query = db.query(EventParticipant.event_id).filter(EventParticipant.user_id == user_id)
+    if event_ids is not None:
+        if not event_ids:
+            return set()
+        query = query.filter(EventParticipant.event_id.in_(event_ids))
+    return {event_id for (event_id,) in query.all()}
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, func, insert
 import pytz
 from datetime import datetime
 
@@ -22,6 +22,24 @@ def create_notification(db: Session, user_id: int, title: str, message: str) ->
     return noti
 
 
+def create_notifications_bulk(db: Session, user_ids: list[int], title: str, message: str, commit: bool = True):
+    """
+    Inserta la misma notificación para varios usuarios en una sola sentencia.
+    """
+    if user_ids:
+        ecuador = pytz.timezone('America/Guayaquil')
+        now_local = datetime.now(ecuador)
+        db.execute(
+            insert(Notification),
+            [
+                {"user_id": user_id, "title": title, "message": message, "is_read": False, "created_at": now_local}
+                for user_id in user_ids
+            ],
+        )
+    if commit:
+        db.commit()
+
+
 def get_user_notifications(db: Session, user_id: int):
     return (
         db.query(Notification)
@@ -31,6 +49,14 @@ def get_user_notifications(db: Session, user_id: int):
     )
 
 
+def count_unread_notifications(db: Session, user_id: int) -> int:
+    return (
+        db.query(func.count(Notification.id))
+        .filter(Notification.user_id == user_id, Notification.is_read == False)
+        .scalar()
+    )
+
+
 def mark_notification_as_read(db: Session, notification_id: int, user_id: int):
     noti = (
         db.query(Notification)
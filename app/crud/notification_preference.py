@@ -0,0 +1,182 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, or_, func, update, case, select
+from sqlalchemy.orm import Session
+
+from app.models.domain.notification import Notification
+from app.models.domain.event import Event
+from app.models.domain.notification_preference import NotificationPreference, DigestFrequency, PREFERENCE_COLUMNS
+from app.models.domain.user import Role
+from app.models.domain.user import User
+from app.models.schema.notification_preference import NotificationPreferenceUpdate
+
+# Margen para que el resumen diario no se salte un día por unos segundos de diferencia
+DIGEST_SCHEDULE_SLACK = timedelta(hours=1)
+
+
+def get_or_create_preference(db: Session, user_id: int) -> NotificationPreference:
+    preference = db.query(NotificationPreference).filter(NotificationPreference.user_id == user_id).first()
+    if not preference:
+        preference = NotificationPreference(
+            user_id=user_id,
+            digest_frequency=DigestFrequency.NONE,
+            last_digest_notification_id=0
+        )
+        db.add(preference)
+        db.commit()
+        db.refresh(preference)
+    return preference
+
+
+def update_preference(db: Session, user_id: int, preference_data: NotificationPreferenceUpdate) -> NotificationPreference:
+    preference = get_or_create_preference(db, user_id)
+    update_data = preference_data.model_dump(exclude_unset=True)
+
+    if update_data.get("digest_frequency") is not None:
+        preference.digest_frequency = update_data["digest_frequency"]
+
+    # Cada lista enviada reemplaza la selección anterior de esa categoría
+    for field, columns in PREFERENCE_COLUMNS.items():
+        if update_data.get(field) is None:
+            continue
+        selected_values = {value.value for value in update_data[field]}
+        for value, column in columns.items():
+            setattr(preference, column, value in selected_values)
+
+    db.commit()
+    db.refresh(preference)
+    return preference
+
+
+def get_digest_candidates(db: Session, now: datetime):
+    """
+    Usuarios con resumen pendiente y al menos una notificación sin leer posterior
+    a su último resumen. Devuelve filas con el total, el id máximo incluido y la
+    marca actual (necesaria para reclamar el resumen con claim_digest).
+    """
+    daily_due = now - timedelta(days=1) + DIGEST_SCHEDULE_SLACK
+    weekly_due = now - timedelta(days=7) + DIGEST_SCHEDULE_SLACK
+
+    return (
+        db.query(
+            NotificationPreference.id.label("preference_id"),
+            NotificationPreference.user_id,
+            NotificationPreference.last_digest_notification_id,
+            User.email,
+            func.count(Notification.id).label("unread_count"),
+            func.max(Notification.id).label("max_notification_id"),
+        )
+        .join(User, User.id == NotificationPreference.user_id)
+        .join(
+            Notification,
+            and_(
+                Notification.user_id == NotificationPreference.user_id,
+                Notification.id > NotificationPreference.last_digest_notification_id,
+                Notification.is_read == False,
+            ),
+        )
+        .filter(
+            or_(
+                and_(
+                    NotificationPreference.digest_frequency == DigestFrequency.DAILY,
+                    or_(NotificationPreference.last_digest_at == None, NotificationPreference.last_digest_at <= daily_due),
+                ),
+                and_(
+                    NotificationPreference.digest_frequency == DigestFrequency.WEEKLY,
+                    or_(NotificationPreference.last_digest_at == None, NotificationPreference.last_digest_at <= weekly_due),
+                ),
+            )
+        )
+        .group_by(NotificationPreference.id, NotificationPreference.user_id,
+                  NotificationPreference.last_digest_notification_id, User.email)
+        .all()
+    )
+
+
+def get_digest_notifications(db: Session, bounds: dict[int, tuple[int, int]], limit: int):
+    """
+    Notificaciones sin leer de cada resumen, como máximo `limit` por usuario (las más recientes).
+    bounds: {user_id: (marca anterior, id máximo reclamado)}. Se incluyen solo los ids dentro
+    de ese rango, así una notificación creada después de leer los candidatos queda para el
+    siguiente resumen en lugar de enviarse dos veces.
+    """
+    if not bounds:
+        return []
+
+    lower_bound = case({user_id: low for user_id, (low, _) in bounds.items()}, value=Notification.user_id)
+    upper_bound = case({user_id: high for user_id, (_, high) in bounds.items()}, value=Notification.user_id)
+    ranked = (
+        select(
+            Notification.user_id,
+            Notification.title,
+            Notification.message,
+            Notification.created_at,
+            func.row_number().over(
+                partition_by=Notification.user_id,
+                order_by=(Notification.created_at.desc(), Notification.id.desc()),
+            ).label("position"),
+        )
+        .where(
+            Notification.user_id.in_(list(bounds)),
+            Notification.id > lower_bound,
+            Notification.id <= upper_bound,
+            Notification.is_read == False,
+        )
+        .subquery()
+    )
+
+    return (
+        db.query(ranked)
+        .filter(ranked.c.position <= limit)
+        .order_by(ranked.c.user_id, ranked.c.position)
+        .all()
+    )
+
+
+def claim_digest(db: Session, preference_id: int, previous_notification_id: int,
+                 notification_id: int, sent_at: datetime) -> bool:
+    """
+    Reclama el resumen de un usuario moviendo su marca solo si nadie la cambió desde que
+    se leyó. Con varios workers ejecutando el mismo cron, solo uno actualiza la fila;
+    los demás reciben rowcount 0 y no encolan el correo. No hace commit: el correo y la
+    marca se guardan en la misma transacción.
+    """
+    result = db.execute(
+        update(NotificationPreference)
+        .where(
+            NotificationPreference.id == preference_id,
+            NotificationPreference.last_digest_notification_id == previous_notification_id,
+        )
+        .values(last_digest_at=sent_at, last_digest_notification_id=notification_id)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+def get_event_notification_recipients(db: Session, event: Event):
+    """
+    Usuarios normales interesados en el tipo, modalidad y nivel del evento, con
+    los canales por los que quieren recibir el aviso. Los usuarios sin
+    preferencias guardadas reciben la notificación en la app.
+    """
+    type_column = getattr(NotificationPreference, PREFERENCE_COLUMNS["event_types"][event.event_type.value])
+    mode_column = getattr(NotificationPreference, PREFERENCE_COLUMNS["event_modes"][event.event_mode.value])
+    level_column = getattr(NotificationPreference, PREFERENCE_COLUMNS["event_levels"][event.event_level.value])
+
+    return (
+        db.query(
+            User.id.label("user_id"),
+            User.email,
+            func.coalesce(NotificationPreference.channel_in_app, True).label("channel_in_app"),
+            func.coalesce(NotificationPreference.channel_email, False).label("channel_email"),
+        )
+        .outerjoin(NotificationPreference, NotificationPreference.user_id == User.id)
+        .filter(User.role == Role.NORMAL)
+        .filter(
+            or_(
+                NotificationPreference.id == None,
+                and_(type_column == True, mode_column == True, level_column == True),
+            )
+        )
+        .all()
+    )
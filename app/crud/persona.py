@@ -20,11 +20,7 @@ def create_persona(db: Session, persona_data: PersonaCreate):
     persona_data.city = verify_location_field(persona_data.city, "Ciudad")
     persona_data.neighborhood = verify_location_field(persona_data.neighborhood, "Barrio")
 
-    # Verificar si el número de teléfono ya está registrado
-    existing_persona = db.query(Persona).filter(Persona.phone_number == persona_data.phone_number).first()
-    if existing_persona:
-        raise HTTPException(status_code=400, detail="El número de teléfono ya está registrado.")
-
+    # El índice único de phone_number detecta los duplicados
     try:
         new_persona = Persona(**persona_data.dict())
         db.add(new_persona)
@@ -72,7 +68,11 @@ def update_persona(db: Session, persona_id: int, persona_data: PersonaUpdate):
     for key, value in update_data.items():
         setattr(persona, key, value)
 
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="El número de teléfono ya está registrado.")
     db.refresh(persona)
     return persona
 def delete_persona(db: Session, persona_id: int):
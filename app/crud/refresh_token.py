@@ -0,0 +1,37 @@
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from app.models.domain.refresh_token import RefreshToken
+
+
+def create_refresh_token_record(db: Session, user_id: int, jti: str, date_expiration: datetime) -> RefreshToken:
+    db_token = RefreshToken(
+        user_id=user_id,
+        jti=jti,
+        date_expiration=date_expiration,
+        is_revoked=False
+    )
+    db.add(db_token)
+    db.commit()
+    return db_token
+
+
+def get_refresh_token_by_jti(db: Session, jti: str):
+    return db.query(RefreshToken).filter(RefreshToken.jti == jti).first()
+
+
+def revoke_refresh_token(db: Session, jti: str):
+    db_token = get_refresh_token_by_jti(db, jti)
+    if db_token and not db_token.is_revoked:
+        db_token.is_revoked = True
+        db.commit()
+    return db_token
+
+
+def revoke_user_refresh_tokens(db: Session, user_id: int):
+    db.query(RefreshToken).filter(
+        RefreshToken.user_id == user_id,
+        RefreshToken.is_revoked == False
+    ).update({RefreshToken.is_revoked: True}, synchronize_session=False)
+    db.commit()
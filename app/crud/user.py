@@ -1,13 +1,24 @@
 from fastapi import HTTPException
+from sqlalchemy import or_, func
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, contains_eager
 from app.models.domain.user import User, Role
 from app.models.schema.user import UserCreate, UserUpdate
 from app.models.domain.persona import Persona
+from app.core.security import invalidate_current_user
 from app.crud.persona import create_persona
-from app.services.crypt import get_password_hash, verify_password
+from app.services.crypt import get_password_hash, verify_password, blind_index
 from app.services.verify import verify_email, verify_structure_password
 
+def get_duplicate_user_detail(error: IntegrityError) -> str:
+    """
+    Traduce la violación de un índice único al mensaje de error del registro.
+    """
+    if "phone_number" in str(error.orig):
+        return "El número de teléfono ya está registrado."
+    return "El correo ya está registrado."
+
+
 def create_user(db: Session, user_data: UserCreate):
     # Validar el correo electrónico
     if not verify_email(user_data.email):
@@ -15,13 +26,6 @@ def create_user(db: Session, user_data: UserCreate):
             status_code=400,
             detail="Correo electrónico no válido."
         )
-        # Verificar si el correo ya está en uso
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
-    if existing_user:
-        raise HTTPException(
-            status_code=400,
-            detail="El correo ya está registrado."
-        )
 
     # Validar la contraseña
     if not verify_structure_password(user_data.password):
@@ -36,27 +40,21 @@ def create_user(db: Session, user_data: UserCreate):
             status_code=400,
             detail="El campo 'persona' es obligatorio."
         )
-    # Verificar si el número de teléfono ya está registrado
-    existing_persona = db.query(Persona).filter(Persona.phone_number == user_data.persona.phone_number).first()
-    if existing_persona:
-        raise HTTPException(status_code=400, detail="El número de teléfono ya está registrado.")
-
-    # Crear la persona primero
-    new_person = Persona(**user_data.persona.model_dump())  # Usa `.model_dump()` si usas Pydantic v2
-    db.add(new_person)
-    db.commit()
-    db.refresh(new_person)
-
-    # Crear el usuario con la persona asociada y sin imagen de perfil
+    # Crear la persona y el usuario en una sola transacción. Los duplicados de correo
+    # y teléfono los detectan los índices únicos, sin consultas previas
     new_user = User(
         email=user_data.email,
         hashed_password=get_password_hash(user_data.password),
         role=user_data.role,  # No necesitas una validación, ya que 'role' tiene un valor predeterminado
-        person_id=new_person.id,  # Enlazamos con la persona creada
+        person=Persona(**user_data.persona.model_dump()),  # Usa `.model_dump()` si usas Pydantic v2
     )
 
     db.add(new_user)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=get_duplicate_user_detail(e))
     db.refresh(new_user)
 
     return new_user
@@ -73,6 +71,7 @@ def update_user(db: Session, user_id: int, user_data: UserUpdate):
     db_user = db.query(User).filter(User.id == user_id).first()
     if not db_user:
         raise HTTPException(status_code=404, detail="Usuario no encontrado.")
+    previous_email = db_user.email
 
     # Validar el correo electrónico si se está actualizando
     if user_data.email and not verify_email(user_data.email):
@@ -101,6 +100,7 @@ def update_user(db: Session, user_id: int, user_data: UserUpdate):
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
+    invalidate_current_user(previous_email)
     return db_user
 
 
@@ -118,6 +118,49 @@ def get_all_users(db: Session):
     return db.query(User).all()
 
 
+def search_users(db: Session, skip: int = 0, limit: int = 50, search: str = None,
+                 role: Role = None, skill_level=None, include_picture: bool = True):
+    """
+    Devuelve una página de usuarios con su persona cargada en la misma consulta
+    y el total de usuarios que cumplen los filtros.
+    """
+    query = db.query(User).join(User.person)
+
+    if role:
+        query = query.filter(User.role == role)
+    if skill_level:
+        query = query.filter(Persona.skill_level == skill_level)
+    if search and search.strip():
+        term = search.strip()
+        query = query.filter(
+            or_(
+                Persona.first_name.icontains(term, autoescape=True),
+                Persona.last_name.icontains(term, autoescape=True),
+                (Persona.first_name + " " + Persona.last_name).icontains(term, autoescape=True),
+                User.email.icontains(term, autoescape=True),
+                # El teléfono está cifrado: solo se puede buscar el número completo
+                Persona.phone_number_hash == blind_index(term),
+                Persona.city.icontains(term, autoescape=True),
+            )
+        )
+
+    total = query.with_entities(func.count(User.id)).scalar()
+
+    person_loader = contains_eager(User.person)
+    if not include_picture:
+        # No traer los bytes de la foto de perfil si no se van a devolver
+        person_loader = person_loader.defer(Persona.profile_picture)
+
+    users = (
+        query.options(person_loader)
+        .order_by(User.id)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+    return users, total
+
+
 def get_user_id_by_email(db: Session, user_email: str):
     """
     Devuelve el ID de un usuario basado en su correo electrónico.
@@ -146,3 +189,8 @@ def update_password(db: Session, user_id: int, new_password: str):
         return user
 
 
+def update_password_hash(db: Session, user: User, hashed_password: str):
+    user.hashed_password = hashed_password
+    db.add(user)
+    db.commit()
+    return user
@@ -0,0 +1,38 @@
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from app.core.config import database_settings
+from app.db.pool import InstrumentedAsyncAdaptedQueuePool
+
+# Motor asíncrono (aiomysql en producción, aiosqlite para pruebas locales).
+# Los endpoints async lo usan para no ocupar un hilo del threadpool mientras esperan a MySQL
+ASYNC_DATABASE_URL = database_settings.sqlalchemy_async_url
+
+
+def _async_engine_options() -> dict:
+    options = {"echo": database_settings.echo}
+    if ASYNC_DATABASE_URL.startswith("sqlite"):
+        return options
+
+    options.update(
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_size=database_settings.pool_size,
+        max_overflow=database_settings.max_overflow,
+        pool_timeout=database_settings.pool_timeout,
+        pool_recycle=database_settings.pool_recycle,
+        pool_pre_ping=database_settings.pool_pre_ping,
+    )
+    if ASYNC_DATABASE_URL.startswith("mysql"):
+        options["connect_args"] = {"connect_timeout": database_settings.connect_timeout}
+    return options
+
+
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **_async_engine_options())
+
+# expire_on_commit=False: después del commit los objetos se siguen leyendo sin volver a consultar
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
+# se obtiene la sesión asíncrona para los endpoints async
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
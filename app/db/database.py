@@ -1,26 +1,34 @@
-import os
-from dotenv import load_dotenv
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-# Cargar variables de entorno desde .env
-load_dotenv()
-
-# Configuración de la base de datos
-DATABASE_URL = (
-    "mysql+pymysql://"
-    + os.getenv("DATABASE_USER")
-    + ":"
-    + os.getenv("DATABASE_PASSWORD")
-    + "@"
-    + os.getenv("DATABASE_HOST")
-    + "/"
-    + os.getenv("DATABASE_NAME")
-)
+from app.core.config import database_settings
+from app.db.pool import InstrumentedQueuePool
+
+# Configuración de la base de datos (variables DATABASE_* del entorno o del .env)
+DATABASE_URL = database_settings.sqlalchemy_url
+
+
+def engine_options(url: str) -> dict:
+    options = {"echo": database_settings.echo}
+    if url.startswith("sqlite"):
+        return options
+
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=database_settings.pool_size,
+        max_overflow=database_settings.max_overflow,
+        pool_timeout=database_settings.pool_timeout,
+        pool_recycle=database_settings.pool_recycle,
+        pool_pre_ping=database_settings.pool_pre_ping,
+    )
+    if url.startswith("mysql"):
+        options["connect_args"] = {"connect_timeout": database_settings.connect_timeout}
+    return options
+
 
 # Crear el motor de la base de datos
-engine = create_engine(DATABASE_URL, echo=True)
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
 
 # Crear una clase base para los modelos
 Base = declarative_base()
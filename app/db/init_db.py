@@ -1,11 +1,14 @@
 from app.db.database import Base, engine
 import app.models.domain.token
+import app.models.domain.email_outbox
+import app.models.domain.refresh_token
 import app.models.domain.user
 import app.models.domain.persona
 import app.models.domain.event
 import app.models.domain.route
 import app.models.domain.event_participant
 from app.models.domain.notification import Notification
+import app.models.domain.notification_preference
 
 
 
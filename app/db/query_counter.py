@@ -0,0 +1,145 @@
+import os
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from dotenv import load_dotenv
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+load_dotenv()
+
+APP_ENV = os.getenv("APP_ENV", "production")
+QUERY_COUNTER_ENABLED = os.getenv("QUERY_COUNTER_ENABLED", "true").lower() == "true"
+# Veces que una misma consulta puede repetirse en una petición antes de avisar de un posible N+1
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+# La detección de N+1 y el registro por petición solo se activan en desarrollo y pruebas
+QUERY_DEBUG = APP_ENV in ("development", "test")
+
+# Listas de parámetros de un IN (...) de cualquier longitud: "(%s, %s, %s)" -> "(?)"
+_PARAMETER_LIST = re.compile(r"\(\s*(?:%s|\?|%\(\w+\)s|:\w+)(?:\s*,\s*(?:%s|\?|%\(\w+\)s|:\w+))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryStats:
+    """
+    Consultas ejecutadas y tiempo total en base de datos dentro de una petición.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+
+    def record(self, statement: str, duration: float):
+        self.count += 1
+        self.duration += duration
+        if QUERY_DEBUG:
+            self.shapes[statement_shape(statement)] += 1
+
+    def repeated_statements(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> list:
+        return [(shape, times) for shape, times in self.shapes.most_common() if times >= threshold]
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Forma de la consulta sin depender de los valores ni del tamaño de los IN.
+    """
+    return _PARAMETER_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+def _record_statement(context, statement: str):
+    stats = _current_stats.get()
+    start_time = getattr(context, "_query_counter_start_time", None)
+    if stats is not None and start_time is not None:
+        context._query_counter_start_time = None
+        stats.record(statement, time.perf_counter() - start_time)
+
+
+# Se registran sobre Engine para contar también las réplicas y el motor asíncrono.
+# El inicio se guarda en el contexto de ejecución (uno por sentencia) y no en conn.info,
+# que pertenece a la conexión del pool y sobrevive a la petición
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current_stats.get() is not None:
+        context._query_counter_start_time = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _record_statement(context, statement)
+
+
+# Las sentencias que fallan (p. ej. por una restricción única) también cuentan
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    if exception_context.execution_context is not None and exception_context.statement is not None:
+        _record_statement(exception_context.execution_context, exception_context.statement)
+
+
+@contextmanager
+def count_queries():
+    """
+    Cuenta las consultas ejecutadas dentro del bloque:
+
+        with count_queries() as stats:
+            get_user_feed(db, user_id)
+        print(stats.count, stats.duration)
+    """
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int):
+    """
+    Falla si el bloque ejecuta más de `limit` consultas. Pensado para pruebas con pytest.
+    """
+    with count_queries() as stats:
+        yield stats
+    if stats.count > limit:
+        raise AssertionError(f"Se ejecutaron {stats.count} consultas, el máximo permitido es {limit}")
+
+
+def get_response_query_count(response) -> int:
+    """
+    Número de consultas que reporta el encabezado Server-Timing de una respuesta
+    (por ejemplo, la de un TestClient) para comprobar el presupuesto de un endpoint.
+    """
+    match = re.search(r'db;dur=[\d.]+;desc="(\d+) queries"', response.headers.get("server-timing", ""))
+    if match is None:
+        raise AssertionError("La respuesta no incluye el conteo de consultas en Server-Timing")
+    return int(match.group(1))
+
+
+async def query_counter_middleware(request: Request, call_next):
+    """
+    Middleware HTTP: agrega el número de consultas y el tiempo en base de datos de la
+    petición en el encabezado Server-Timing y, en desarrollo, avisa de posibles N+1.
+    """
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        _current_stats.reset(token)
+
+    duration_ms = stats.duration * 1000
+    response.headers.append("Server-Timing", f'db;dur={duration_ms:.1f};desc="{stats.count} queries"')
+
+    if QUERY_DEBUG:
+        print(f"🗄️ [SQL] {request.method} {request.url.path}: {stats.count} consultas en {duration_ms:.1f} ms")
+        for shape, times in stats.repeated_statements():
+            print(f"⚠️ [SQL] Posible N+1 en {request.method} {request.url.path}: {times} veces -> {shape[:200]}")
+    return response
@@ -0,0 +1,108 @@
+"""
+Revisión de planes de ejecución de las consultas más usadas.
+
+Ejecuta cada función crud "caliente", captura el SQL que emite y le aplica EXPLAIN
+en la base configurada. Falla si alguna consulta recorre completa una tabla que debería
+consultarse por índice. Conviene ejecutarlo contra una base con datos representativos
+(con tablas casi vacías el optimizador puede preferir un recorrido completo):
+
+    python -m app.manage check-plans
+"""
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+import app.db.init_db  # noqa: F401  Registra todos los modelos antes de ejecutar las funciones crud
+from app.core.security import get_user
+from app.crud.event import get_upcoming_events
+from app.crud.event_participant import count_participants_by_event, get_registered_event_ids
+from app.crud.notification import get_user_notifications, count_unread_notifications
+
+SAMPLE_USER_ID = 1
+SAMPLE_EVENT_IDS = [1, 2, 3]
+
+# (nombre, tablas que no deben recorrerse completas, función a revisar)
+HOT_QUERIES = [
+    ("event.get_upcoming_events", {"event"},
+     lambda db: get_upcoming_events(db, include_image=False)),
+    ("notification.get_user_notifications", {"notification"},
+     lambda db: get_user_notifications(db, SAMPLE_USER_ID)),
+    ("notification.count_unread_notifications", {"notification"},
+     lambda db: count_unread_notifications(db, SAMPLE_USER_ID)),
+    ("event_participant.count_participants_by_event", {"event_participant"},
+     lambda db: count_participants_by_event(db, SAMPLE_EVENT_IDS)),
+    ("event_participant.get_registered_event_ids", {"event_participant"},
+     lambda db: get_registered_event_ids(db, SAMPLE_USER_ID, SAMPLE_EVENT_IDS)),
+    ("security.get_user", {"user"},
+     lambda db: get_user(db, "plan-check@example.com")),
+]
+
+
+@dataclass
+class QueryPlanResult:
+    name: str
+    statements: list = field(default_factory=list)
+    full_scans: list = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.full_scans
+
+
+def capture_statements(db: Session, fn) -> list:
+    """
+    Ejecuta fn(db) y devuelve las sentencias SELECT enviadas a la base con sus parámetros.
+    """
+    statements = []
+    bind = db.get_bind()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(bind, "before_cursor_execute", before_cursor_execute)
+    try:
+        fn(db)
+    finally:
+        event.remove(bind, "before_cursor_execute", before_cursor_execute)
+        db.rollback()
+    return statements
+
+
+def find_full_scans(db: Session, statement: str, parameters) -> list:
+    """
+    Devuelve las tablas que el plan de la sentencia recorre completas.
+    Soporta MySQL (EXPLAIN, type = ALL) y SQLite (EXPLAIN QUERY PLAN, SCAN sin índice).
+    """
+    connection = db.connection()
+    dialect = connection.dialect.name
+
+    if dialect == "mysql":
+        rows = connection.exec_driver_sql("EXPLAIN " + statement, parameters).mappings().all()
+        return [row["table"] for row in rows if row["type"] == "ALL"]
+
+    if dialect == "sqlite":
+        rows = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).mappings().all()
+        scans = []
+        for row in rows:
+            detail = row["detail"]
+            if detail.startswith("SCAN ") and " USING " not in detail:
+                scans.append(detail.split()[1])
+        return scans
+
+    raise RuntimeError(f"EXPLAIN no soportado para el dialecto {dialect}")
+
+
+def check_query_plans(db: Session) -> list[QueryPlanResult]:
+    results = []
+    for name, indexed_tables, fn in HOT_QUERIES:
+        result = QueryPlanResult(name=name, statements=capture_statements(db, fn))
+        for statement, parameters in result.statements:
+            result.full_scans.extend(
+                table for table in find_full_scans(db, statement, parameters)
+                if table.strip('`"') in indexed_tables
+            )
+        db.rollback()
+        results.append(result)
+    return results
@@ -0,0 +1,94 @@
+import hashlib
+import random
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import create_engine, event, Select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import database_settings
+from app.db.database import engine, engine_options
+from app.services.cache import TTLCache
+from app.services.rate_limit import get_client_ip
+
+# Motores de las réplicas de solo lectura (vacío = todo va al primario)
+replica_engines = [create_engine(url, **engine_options(url)) for url in database_settings.replica_url_list]
+
+# Estado de la petición actual: si debe leer del primario y si ya escribió
+_request_state: ContextVar[Optional[dict]] = ContextVar("db_routing_state", default=None)
+
+# Clientes que escribieron recientemente y deben leer del primario durante unos segundos
+recent_writers = TTLCache(maxsize=100000, ttl=database_settings.replica_sticky_seconds)
+
+
+def _mark_write(session: Session):
+    session.info["use_primary"] = True
+    state = _request_state.get()
+    if state is not None:
+        state["wrote"] = True
+
+
+# Se registran sobre Session para detectar las escrituras de cualquier sesión (incluida la async)
+@event.listens_for(Session, "after_flush")
+def _after_flush(session, flush_context):
+    _mark_write(session)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _on_orm_execute(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _mark_write(orm_execute_state.session)
+
+
+class RoutingSession(Session):
+    """
+    Sesión que envía los SELECT a una réplica y todo lo demás al primario.
+    Una vez que la sesión escribe, o si el cliente escribió hace poco,
+    también sus lecturas van al primario para que vea sus propios cambios.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if (
+            replica_engines
+            and isinstance(clause, Select)
+            and not self._flushing
+            and not self.info.get("use_primary")
+            and not _must_read_primary()
+        ):
+            # Cada sesión usa siempre la misma réplica
+            if "replica" not in self.info:
+                self.info["replica"] = random.choice(replica_engines)
+            return self.info["replica"]
+        return engine
+
+
+def _must_read_primary() -> bool:
+    state = _request_state.get()
+    return state is not None and state["force_primary"]
+
+
+ReadSessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine)
+
+
+def _client_key(request: Request) -> str:
+    authorization = request.headers.get("authorization")
+    if authorization:
+        return "auth:" + hashlib.sha256(authorization.encode()).hexdigest()
+    return "ip:" + get_client_ip(request)
+
+
+async def primary_stickiness_middleware(request: Request, call_next):
+    """
+    Middleware HTTP: si el cliente escribió en los últimos segundos, sus lecturas
+    van al primario; si la petición escribe, el cliente queda marcado.
+    """
+    key = _client_key(request)
+    state = {"force_primary": recent_writers.get(key) is not None, "wrote": False}
+    token = _request_state.set(state)
+    try:
+        return await call_next(request)
+    finally:
+        _request_state.reset(token)
+        if state["wrote"]:
+            recent_writers.set(key, True)
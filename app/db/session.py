@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from app.db.database import SessionLocal
+from app.db.routing import ReadSessionLocal
 
 
 # se obtiene la sesión para hacer las operaciones crud
@@ -8,4 +9,13 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# sesión para endpoints de solo lectura: los SELECT pueden ir a una réplica
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -0,0 +1,144 @@
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.db.query_counter import statement_shape
+
+load_dotenv()
+
+SLOW_QUERY_LOG_ENABLED = os.getenv("SLOW_QUERY_LOG_ENABLED", "true").lower() == "true"
+# Umbral en milisegundos a partir del cual una consulta se registra como lenta
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+# Máximo de consultas distintas (por forma) que se guardan en memoria
+SLOW_QUERY_MAX_FINGERPRINTS = int(os.getenv("SLOW_QUERY_MAX_FINGERPRINTS", "500"))
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_DB_DIR = os.path.join(_APP_DIR, "db")
+
+
+def parameter_shape(parameters, executemany: bool = False):
+    """
+    Tipos de los parámetros, sin sus valores (no se registran datos personales).
+    """
+    if executemany and isinstance(parameters, (list, tuple)) and parameters:
+        return f"{len(parameters)} x {parameter_shape(parameters[0])}"
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def find_call_site() -> str:
+    """
+    Primera función de la aplicación (fuera de app/db) en la pila de llamadas,
+    normalmente la función crud o el servicio que originó la consulta.
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_APP_DIR) and not filename.startswith(_DB_DIR):
+            module = os.path.relpath(filename, os.path.dirname(_APP_DIR))
+            return f"{module}:{frame.f_lineno} {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "desconocido"
+
+
+class SlowQueryLog:
+    """
+    Agrupa las consultas lentas por forma (SQL sin valores) desde el inicio del proceso.
+    """
+
+    def __init__(self, max_fingerprints: int = SLOW_QUERY_MAX_FINGERPRINTS):
+        self.max_fingerprints = max_fingerprints
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, parameters, duration_ms: float, row_count: int, call_site: str):
+        fingerprint = statement_shape(statement)
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is None:
+                if len(self._entries) >= self.max_fingerprints:
+                    # Se descarta la consulta que menos tiempo acumula
+                    del self._entries[min(self._entries, key=lambda key: self._entries[key]["total_ms"])]
+                entry = {
+                    "fingerprint": fingerprint,
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "call_sites": {},
+                }
+                self._entries[fingerprint] = entry
+
+            entry["count"] += 1
+            entry["total_ms"] += duration_ms
+            entry["max_ms"] = max(entry["max_ms"], duration_ms)
+            entry["last_rows"] = row_count
+            entry["last_parameters"] = parameters
+            entry["last_seen"] = datetime.utcnow()
+            entry["call_sites"][call_site] = entry["call_sites"].get(call_site, 0) + 1
+
+    def top(self, limit: int = 20, order_by: str = "max_ms") -> list[dict]:
+        with self._lock:
+            entries = [
+                {**entry, "avg_ms": entry["total_ms"] / entry["count"], "call_sites": dict(entry["call_sites"])}
+                for entry in self._entries.values()
+            ]
+        entries.sort(key=lambda entry: entry[order_by], reverse=True)
+        return entries[:limit]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+slow_query_log = SlowQueryLog()
+
+
+def _record_if_slow(context, statement: str, parameters, executemany: bool, row_count: int, failed: bool = False):
+    start_time = getattr(context, "_slow_query_start_time", None)
+    if start_time is None:
+        return
+    context._slow_query_start_time = None
+
+    duration_ms = (time.perf_counter() - start_time) * 1000
+    if duration_ms < SLOW_QUERY_THRESHOLD_MS:
+        return
+
+    # Solo las consultas lentas pagan el costo de recorrer la pila y describir los parámetros
+    call_site = find_call_site()
+    shape = parameter_shape(parameters, executemany)
+    slow_query_log.record(statement, shape, duration_ms, row_count, call_site)
+    print(
+        f"🐢 [SQL lento{' con error' if failed else ''}] {duration_ms:.1f} ms, {row_count} filas, {call_site}: "
+        f"{statement_shape(statement)[:500]} | parámetros: {shape}"
+    )
+
+
+# El inicio se guarda en el contexto de ejecución de la sentencia y no en conn.info, que
+# pertenece a la conexión del pool: así una sentencia que falla no deja entradas pendientes
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if SLOW_QUERY_LOG_ENABLED and context is not None:
+        context._slow_query_start_time = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _record_if_slow(context, statement, parameters, executemany, cursor.rowcount)
+
+
+# Una sentencia que falla tras esperar (p. ej. por un bloqueo) también es una consulta lenta
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    context = exception_context.execution_context
+    if context is not None and exception_context.statement is not None:
+        _record_if_slow(context, exception_context.statement, exception_context.parameters,
+                        bool(getattr(context, "executemany", False)), -1, failed=True)
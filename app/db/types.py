@@ -0,0 +1,34 @@
+from enum import Enum
+
+from sqlalchemy import String
+from sqlalchemy.types import TypeDecorator
+
+from app.services.crypt import encrypt_str_data, decrypt_str_data_cached
+
+
+class EncryptedString(TypeDecorator):
+    """
+    Columna de texto cifrada con AES-CBC. El valor se cifra al escribir y se descifra
+    al leer, por lo que el modelo trabaja siempre con texto plano.
+    Al usar un IV aleatorio no admite búsquedas por igualdad: para eso se debe
+    agregar una columna con blind_index() del valor.
+    """
+    impl = String
+    cache_ok = True
+
+    def __init__(self, length: int = 255, enum_class: type = None, **kwargs):
+        super().__init__(length, **kwargs)
+        self.enum_class = enum_class
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, Enum):
+            value = value.value
+        return encrypt_str_data(str(value))
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        value = decrypt_str_data_cached(value)
+        return self.enum_class(value) if self.enum_class else value
@@ -1,15 +1,23 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.openapi.utils import get_openapi
 from starlette.staticfiles import StaticFiles
-from app.api.endpoints import auth, event, route, event_participant, notification
+from app.api.endpoints import auth, event, route, event_participant, notification, me, internal, metrics
+from app.core.config import database_settings
 from app.core.init_data import create_admin_user
 from app.db.init_db import init_db
+from app.db.query_counter import QUERY_COUNTER_ENABLED, query_counter_middleware
+from app.db.routing import replica_engines, primary_stickiness_middleware
+from app.services.crypt import shutdown_password_hasher
+from app.services.email_service import precompile_email_templates
+from app.services.metrics import PrometheusMiddleware
 from app.services.scheduler_notifications import start_scheduler
 
 
+# Todas las respuestas JSON se serializan con orjson
 app = FastAPI(
-
+    default_response_class=ORJSONResponse,
 )
 
 # 🟢 Permitir peticiones CORS
@@ -22,21 +30,43 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 🔀 Leer del primario justo después de escribir (solo si hay réplicas configuradas)
+if replica_engines:
+    app.middleware("http")(primary_stickiness_middleware)
+
+# 🗄️ Conteo de consultas SQL por petición (encabezado Server-Timing)
+if QUERY_COUNTER_ENABLED:
+    app.middleware("http")(query_counter_middleware)
+
+# 📈 Métricas de Prometheus por ruta (se agrega al final para medir toda la petición)
+app.add_middleware(PrometheusMiddleware)
+
 # 📦 Incluir rutas
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
 app.include_router(event.router, prefix="/event", tags=["event"])
 app.include_router(route.router, prefix="/route", tags=["route"])
 app.include_router(event_participant.router, prefix="/participants", tags=["participants"])
 app.include_router(notification.router, prefix="/notifications", tags=["notifications"])
+app.include_router(me.router, prefix="/me", tags=["me"])
+app.include_router(internal.router, prefix="/internal", tags=["internal"])
+app.include_router(metrics.router, tags=["metrics"])
 
 
 # ⚙️ Inicializar base de datos y crear admin
 @app.on_event("startup")
 def on_startup():
-    init_db()
-    create_admin_user()
+    # En producción el esquema y el administrador se preparan con `python -m app.manage`
+    if database_settings.startup_schema == "create_all":
+        init_db()
+        create_admin_user()
+    precompile_email_templates()
     start_scheduler()
 
+
+@app.on_event("shutdown")
+def on_shutdown():
+    shutdown_password_hasher()
+
 def custom_openapi():
     if app.openapi_schema:
         return app.openapi_schema
@@ -0,0 +1,88 @@
+"""
+Tareas de administración que se ejecutan una vez por despliegue, fuera de los workers:
+
+    python -m app.manage migrate [--revision head]
+    python -m app.manage create-admin
+    python -m app.manage check-plans
+"""
+import argparse
+import sys
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+
+import app.db.init_db  # noqa: F401  Registra todos los modelos antes de usar los mappers
+from app.core.init_data import create_admin_user
+from app.db.database import engine, SessionLocal
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+
+def get_alembic_config() -> Config:
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "migrations"))
+    return config
+
+
+def _stamp_existing_database(config: Config):
+    """
+    Las bases creadas con create_all no tienen la tabla alembic_version. Se marcan con
+    la revisión que corresponde a su esquema para no volver a crear sus tablas.
+    """
+    inspector = inspect(engine)
+    if inspector.has_table("alembic_version") or not inspector.has_table("user"):
+        return
+
+    persona_columns = {column["name"] for column in inspector.get_columns("persona")}
+    revision = "0003" if "phone_number_hash" in persona_columns else "0001"
+    print(f"Base de datos sin versionar: se marca con la revisión {revision}")
+    command.stamp(config, revision)
+
+
+def migrate(revision: str = "head"):
+    config = get_alembic_config()
+    _stamp_existing_database(config)
+    command.upgrade(config, revision)
+    print(f"Migraciones aplicadas hasta {revision}.")
+
+
+def check_plans() -> bool:
+    # Se importa aquí para no cargar los módulos crud en las demás tareas
+    from app.db.query_plans import check_query_plans
+
+    db = SessionLocal()
+    try:
+        results = check_query_plans(db)
+    finally:
+        db.close()
+
+    for result in results:
+        status = "OK" if result.ok else f"RECORRIDO COMPLETO en {', '.join(result.full_scans)}"
+        print(f"{result.name}: {status}")
+    return all(result.ok for result in results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.manage")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = subparsers.add_parser("migrate", help="Aplica las migraciones pendientes")
+    migrate_parser.add_argument("--revision", default="head")
+
+    subparsers.add_parser("create-admin", help="Crea el usuario administrador si no existe")
+    subparsers.add_parser("check-plans", help="Revisa con EXPLAIN que las consultas frecuentes usen índices")
+
+    args = parser.parse_args(argv)
+    if args.command == "migrate":
+        migrate(args.revision)
+    elif args.command == "create-admin":
+        create_admin_user()
+    elif args.command == "check-plans":
+        if not check_plans():
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
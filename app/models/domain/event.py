@@ -28,7 +28,7 @@ class Event(Base):
     event_type = Column(SQLAEnum(EventType), nullable=False)
     route_id = Column(Integer, ForeignKey("route.id", ondelete="CASCADE"), nullable=False)
     meeting_point = Column(String(255), nullable=False)
-    creation_date = Column(DateTime, default=datetime.utcnow)
+    creation_date = Column(DateTime, default=datetime.utcnow, index=True)
     event_level = Column(SQLAEnum(EventLevel), nullable=False)
     event_mode = Column(SQLAEnum(EventMode), nullable=False)
     is_available = Column(Boolean, default=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.database import Base
@@ -14,3 +14,8 @@ class EventParticipant(Base):
     # Relaciones
     event = relationship("Event", back_populates="participants")
     user = relationship("User", back_populates="event_participations")
+
+    __table_args__ = (
+        # Participantes de un evento e inscripción de un usuario en un evento
+        Index("ix_event_participant_event_id_user_id", "event_id", "user_id"),
+    )
@@ -0,0 +1,66 @@
+from enum import Enum
+
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Boolean, Enum as SQLAEnum
+from sqlalchemy.orm import relationship
+
+from app.db.database import Base
+from app.models.domain.event import EventType, EventMode, EventLevel
+
+
+class DigestFrequency(str, Enum):
+    NONE = "Ninguno"
+    DAILY = "Diario"
+    WEEKLY = "Semanal"
+
+
+class NotificationChannel(str, Enum):
+    IN_APP = "App"
+    EMAIL = "Correo"
+
+
+class NotificationPreference(Base):
+    __tablename__ = "notification_preference"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), nullable=False, unique=True, index=True)
+    digest_frequency = Column(SQLAEnum(DigestFrequency), nullable=False, default=DigestFrequency.NONE)
+    # Marcas del último resumen enviado, para no volver a recorrer notificaciones antiguas
+    last_digest_at = Column(DateTime, nullable=True)
+    last_digest_notification_id = Column(Integer, nullable=False, default=0)
+
+    # Tipos, modalidades y niveles de evento de los que el usuario quiere ser notificado
+    notify_training = Column(Boolean, nullable=False, default=True)
+    notify_ride = Column(Boolean, nullable=False, default=True)
+    notify_mountain = Column(Boolean, nullable=False, default=True)
+    notify_road = Column(Boolean, nullable=False, default=True)
+    notify_basic = Column(Boolean, nullable=False, default=True)
+    notify_intermediate = Column(Boolean, nullable=False, default=True)
+    notify_advanced = Column(Boolean, nullable=False, default=True)
+
+    # Canales por los que se entregan las notificaciones
+    channel_in_app = Column(Boolean, nullable=False, default=True)
+    channel_email = Column(Boolean, nullable=False, default=False)
+
+    user = relationship("User", back_populates="notification_preference")
+
+
+# Columna booleana que corresponde a cada valor de preferencia
+PREFERENCE_COLUMNS = {
+    "event_types": {
+        EventType.TRAINING.value: "notify_training",
+        EventType.RIDE.value: "notify_ride",
+    },
+    "event_modes": {
+        EventMode.MOUNTAIN.value: "notify_mountain",
+        EventMode.ROAD.value: "notify_road",
+    },
+    "event_levels": {
+        EventLevel.BASIC.value: "notify_basic",
+        EventLevel.INTERMEDIATE.value: "notify_intermediate",
+        EventLevel.ADVANCED.value: "notify_advanced",
+    },
+    "channels": {
+        NotificationChannel.IN_APP.value: "channel_in_app",
+        NotificationChannel.EMAIL.value: "channel_email",
+    },
+}
@@ -1,8 +1,10 @@
 from enum import Enum
 
 from sqlalchemy import Column, Integer, String, Enum as SQLAEnum, LargeBinary
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from app.db.database import Base
+from app.db.types import EncryptedString
+from app.services.crypt import blind_index
 
 class SkillLevel(str, Enum):
     LOW = "Bajo"
@@ -26,10 +28,12 @@ class Persona(Base):
     id = Column(Integer, primary_key=True, index=True)
     first_name = Column(String(255), nullable=False)
     last_name = Column(String(255), nullable=False)
-    phone_number = Column(String(15),  nullable=False)
+    # Datos personales cifrados; el teléfono se busca y se valida como único por su índice ciego
+    phone_number = Column(EncryptedString(255), nullable=False)
+    phone_number_hash = Column(String(64), unique=True, index=True, nullable=False)
     city = Column(String(255), nullable=False)
     neighborhood = Column(String(255), nullable=False)
-    blood_type = Column(SQLAEnum(BloodType), nullable=False)
+    blood_type = Column(EncryptedString(255, enum_class=BloodType), nullable=False)
     skill_level = Column(SQLAEnum(SkillLevel), nullable=False)
     profile_picture = Column(LargeBinary, nullable=True)
 
@@ -37,3 +41,8 @@ class Persona(Base):
 
     # Relación con User especificando el foreign_key
     user = relationship("User", back_populates="person", uselist=False, cascade="all, delete")
+
+    @validates("phone_number")
+    def _set_phone_number_hash(self, key, value):
+        self.phone_number_hash = blind_index(value)
+        return value
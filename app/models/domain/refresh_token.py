@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+
+from app.db.database import Base
+
+
+class RefreshToken(Base):
+    __tablename__ = "refresh_token"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), nullable=False, index=True)
+    jti = Column(String(64), unique=True, index=True, nullable=False)
+    date_creation = Column(DateTime, default=datetime.utcnow)
+    date_expiration = Column(DateTime, nullable=False)
+    is_revoked = Column(Boolean, default=False)
+
+    # Relación con Usuario
+    user = relationship("User", back_populates="refresh_tokens")
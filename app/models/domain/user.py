@@ -26,8 +26,16 @@ class User(Base):
     # Relación con AuthToken
     token = relationship("AuthToken", uselist=False, back_populates="user")
 
+    # Relación con RefreshToken
+    refresh_tokens = relationship("RefreshToken", back_populates="user", cascade="all, delete")
+
     # Relación con EventParticipant
     event_participations = relationship("EventParticipant", back_populates="user", cascade="all, delete")
 
     # Relación con User
     notifications = relationship("Notification", back_populates="user", cascade="all, delete")
+
+    # Relación con NotificationPreference
+    notification_preference = relationship(
+        "NotificationPreference", uselist=False, back_populates="user", cascade="all, delete"
+    )
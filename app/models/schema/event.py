@@ -59,9 +59,9 @@ class EventResponse(BaseModel):
         extra = "ignore"
 
     @classmethod
-    def from_orm(cls, obj):
+    def from_orm(cls, obj, include_image: bool = True):
         image_base64 = None
-        if obj.image and isinstance(obj.image, (bytes, bytearray)):
+        if include_image and obj.image and isinstance(obj.image, (bytes, bytearray)):
             try:
                 image_base64 = f"data:image/png;base64,{base64.b64encode(obj.image).decode()}"
             except Exception:
@@ -0,0 +1,24 @@
+from typing import List
+
+from pydantic import BaseModel
+
+from app.models.schema.event import EventResponse
+
+
+class FeedEventResponse(EventResponse):
+    is_registered: bool
+    participant_count: int
+
+    @classmethod
+    def from_orm(cls, obj, include_image: bool = True, is_registered: bool = False, participant_count: int = 0):
+        event = EventResponse.from_orm(obj, include_image=include_image)
+        return cls(
+            **event.model_dump(),
+            is_registered=is_registered,
+            participant_count=participant_count
+        )
+
+
+class FeedResponse(BaseModel):
+    events: List[FeedEventResponse]
+    unread_notifications: int
@@ -0,0 +1,40 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from app.models.domain.notification_preference import DigestFrequency, NotificationChannel, PREFERENCE_COLUMNS
+from app.models.schema.event import EventType, EventMode, EventLevel
+
+
+class NotificationPreferenceUpdate(BaseModel):
+    digest_frequency: Optional[DigestFrequency] = None
+    event_types: Optional[List[EventType]] = None
+    event_modes: Optional[List[EventMode]] = None
+    event_levels: Optional[List[EventLevel]] = None
+    channels: Optional[List[NotificationChannel]] = None
+
+
+class NotificationPreferenceResponse(BaseModel):
+    digest_frequency: DigestFrequency
+    last_digest_at: Optional[datetime] = None
+    event_types: List[EventType]
+    event_modes: List[EventMode]
+    event_levels: List[EventLevel]
+    channels: List[NotificationChannel]
+
+    class Config:
+        from_attributes = True
+
+    @classmethod
+    def from_orm_custom(cls, preference):
+        # Convertir las columnas booleanas en listas de valores seleccionados
+        selected = {
+            field: [value for value, column in columns.items() if getattr(preference, column)]
+            for field, columns in PREFERENCE_COLUMNS.items()
+        }
+        return cls(
+            digest_frequency=preference.digest_frequency,
+            last_digest_at=preference.last_digest_at,
+            **selected
+        )
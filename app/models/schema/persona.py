@@ -45,10 +45,10 @@ class PersonaResponse(PersonaBase):
         from_attributes = True
 
     @classmethod
-    def from_orm(cls, obj):
+    def from_orm(cls, obj, include_picture: bool = True):
         # Convertir imagen de bytes a base64 con encabezado
         profile_picture = None
-        if obj.profile_picture and isinstance(obj.profile_picture, (bytes, bytearray)):
+        if include_picture and obj.profile_picture and isinstance(obj.profile_picture, (bytes, bytearray)):
             try:
                 profile_picture = f"data:image/png;base64,{base64.b64encode(obj.profile_picture).decode()}"
             except Exception:
@@ -9,6 +9,7 @@ from app.models.schema.persona import PersonaCreate, PersonaBase, PersonaRespons
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
 
 class TokenData(BaseModel):
     email: str  # Usamos el email en lugar del username
@@ -19,6 +20,23 @@ class Role(str, Enum):
     NORMAL = "Normal"
 
 
+# Identidad del usuario autenticado, sin depender de una sesión de base de datos
+class CurrentUser(BaseModel):
+    id: int
+    email: str
+    role: Role
+    person_id: int
+
+    @classmethod
+    def from_orm_custom(cls, user):
+        return cls(
+            id=user.id,
+            email=user.email,
+            role=user.role,
+            person_id=user.person_id
+        )
+
+
 # Esquema base para los datos de un usuario (todos los campos son requeridos)
 class UserBase(BaseModel):
     email: EmailStr
@@ -68,15 +86,26 @@ class UserWithPersonaResponse(BaseModel):
     class Config:
         from_attributes = True
     @classmethod
-    def from_orm_custom(cls, user):
+    def from_orm_custom(cls, user, include_picture: bool = True):
         return cls(
             id=user.id,
             role=user.role,
-            person=PersonaResponse.from_orm(user.person) if user.person else None
+            person=PersonaResponse.from_orm(user.person, include_picture=include_picture) if user.person else None
         )
 class UserBasicResponse(BaseModel):
     id: int
     person: PersonaResponse
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class UserImportError(BaseModel):
+    row: int
+    email: Optional[str] = None
+    detail: str
+
+
+class UserImportReport(BaseModel):
+    created: int
+    errors: list[UserImportError]
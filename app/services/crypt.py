@@ -1,26 +1,195 @@
+import asyncio
+import hashlib
+import hmac
+import multiprocessing
 import os
+import threading
+import time
 from base64 import b64encode, b64decode
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
 
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import padding
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from dotenv import load_dotenv
+from fastapi import HTTPException
 from passlib.context import CryptContext
 
 load_dotenv()
 
+# Costo de bcrypt; los hashes con otro costo se regeneran al iniciar sesión
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Procesos dedicados al hash de contraseñas (0 = ejecutar en el mismo proceso)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 2)))
+# Máximo de operaciones de hash en cola antes de responder 503
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+PASSWORD_HASH_RETRY_AFTER = int(os.getenv("PASSWORD_HASH_RETRY_AFTER", "2"))
+# Hashes de una importación masiva en vuelo a la vez, para no adelantarse a los inicios de sesión
+PASSWORD_HASH_BATCH_MAX_IN_FLIGHT = int(
+    os.getenv("PASSWORD_HASH_BATCH_MAX_IN_FLIGHT", str(max(PASSWORD_HASH_WORKERS // 2, 1)))
+)
+
 # Configuración de bcrypt para hashear contraseñas
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
 # Obtención de la clave de cifrado
 AES_KEY = os.getenv("AES_KEY").encode()
+# Clave del índice ciego (HMAC). Si no se define se deriva de AES_KEY
+BLIND_INDEX_KEY = (
+    os.getenv("BLIND_INDEX_KEY").encode() if os.getenv("BLIND_INDEX_KEY")
+    else hmac.new(AES_KEY, b"blind-index", hashlib.sha256).digest()
+)
+# Valores descifrados que se mantienen en memoria para listados repetidos
+PII_DECRYPT_CACHE_SIZE = int(os.getenv("PII_DECRYPT_CACHE_SIZE", "4096"))
+
+# El algoritmo (con la clave ya validada) se crea una sola vez; por valor solo cambia el IV
+_aes_algorithm = algorithms.AES(AES_KEY)
+_backend = default_backend()
+
+_executor = None
+_executor_lock = threading.Lock()
+_pending_hashes = threading.BoundedSemaphore(PASSWORD_HASH_MAX_PENDING)
+
+
+# Funciones ejecutadas dentro de los procesos del pool
+def _hash_password(password):
+    return pwd_context.hash(password)
+
+
+def _verify_and_update_password(original_password, hashed_password):
+    return pwd_context.verify_and_update(original_password, hashed_password)
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def _reset_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _submit(fn, *args):
+    """
+    Envía una operación de bcrypt al pool de procesos.
+    Si la cola está llena responde 503 con Retry-After en lugar de esperar.
+    """
+    if not _pending_hashes.acquire(blocking=False):
+        raise HTTPException(
+            status_code=503,
+            detail="El servidor está ocupado, intenta nuevamente en unos segundos.",
+            headers={"Retry-After": str(PASSWORD_HASH_RETRY_AFTER)},
+        )
+
+    try:
+        try:
+            future = _get_executor().submit(fn, *args)
+        except BrokenProcessPool:
+            # Un proceso murió; se recrea el pool una sola vez
+            _reset_executor()
+            future = _get_executor().submit(fn, *args)
+    except Exception:
+        _pending_hashes.release()
+        raise
+
+    future.add_done_callback(lambda _: _pending_hashes.release())
+    return future
+
+
+def verify_and_update_password(original_password, hashed_password):
+    """
+    Devuelve (es_valida, nuevo_hash). nuevo_hash no es None cuando el hash
+    guardado usa un costo distinto al configurado y debe reemplazarse.
+    """
+    if PASSWORD_HASH_WORKERS <= 0:
+        return _verify_and_update_password(original_password, hashed_password)
+    return _submit(_verify_and_update_password, original_password, hashed_password).result()
+
+
+async def verify_and_update_password_async(original_password, hashed_password):
+    if PASSWORD_HASH_WORKERS <= 0:
+        return _verify_and_update_password(original_password, hashed_password)
+    return await asyncio.wrap_future(
+        _submit(_verify_and_update_password, original_password, hashed_password)
+    )
 
 
 def verify_password(original_password, hashed_password):
-    return pwd_context.verify(original_password, hashed_password)
+    is_valid, _ = verify_and_update_password(original_password, hashed_password)
+    return is_valid
 
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    if PASSWORD_HASH_WORKERS <= 0:
+        return _hash_password(password)
+    return _submit(_hash_password, password).result()
+
+
+def get_password_hashes(passwords: list[str]) -> list[str]:
+    """
+    Hashea varias contraseñas en paralelo repartiéndolas entre los procesos del pool.
+    Pensado para importaciones masivas: cada hash pasa por la misma cola acotada que los
+    inicios de sesión y solo hay PASSWORD_HASH_BATCH_MAX_IN_FLIGHT en vuelo a la vez.
+    Si la cola está llena se espera en lugar de responder 503.
+    """
+    if PASSWORD_HASH_WORKERS <= 0:
+        return [_hash_password(password) for password in passwords]
+
+    hashes = [None] * len(passwords)
+    in_flight = {}
+
+    def collect(done):
+        for future in done:
+            hashes[in_flight.pop(future)] = future.result()
+
+    for index, password in enumerate(passwords):
+        while True:
+            if len(in_flight) < PASSWORD_HASH_BATCH_MAX_IN_FLIGHT:
+                try:
+                    in_flight[_submit(_hash_password, password)] = index
+                    break
+                except HTTPException:
+                    # Cola llena por otras peticiones: se espera a que se libere
+                    pass
+            if in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+            else:
+                time.sleep(PASSWORD_HASH_RETRY_AFTER / 10)
+
+    collect(wait(in_flight).done)
+    return hashes
+
+
+async def get_password_hash_async(password):
+    if PASSWORD_HASH_WORKERS <= 0:
+        return _hash_password(password)
+    return await asyncio.wrap_future(_submit(_hash_password, password))
+
+
+def shutdown_password_hasher():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
 
 
 def generate_iv():
@@ -29,7 +198,7 @@ def generate_iv():
 
 def encrypt_str_data(data: str):
     iv = generate_iv()
-    cipher = Cipher(algorithms.AES(AES_KEY), modes.CBC(iv), backend=default_backend())
+    cipher = Cipher(_aes_algorithm, modes.CBC(iv), backend=_backend)
     encryptor = cipher.encryptor()
 
     # padder
@@ -46,7 +215,7 @@ def decrypt_str_data(encrypted_data: str):
     iv = raw_data[:16]  # Extraer IV
     encrypted_data = raw_data[16:]  # Extraer datos cifrados
 
-    cipher = Cipher(algorithms.AES(AES_KEY), modes.CBC(iv), backend=default_backend())
+    cipher = Cipher(_aes_algorithm, modes.CBC(iv), backend=_backend)
     decryptor = cipher.decryptor()
 
     # Descifrar y eliminar padding
@@ -56,3 +225,20 @@ def decrypt_str_data(encrypted_data: str):
     return data.decode()
 
 
+@lru_cache(maxsize=PII_DECRYPT_CACHE_SIZE)
+def decrypt_str_data_cached(encrypted_data: str):
+    """
+    Igual que decrypt_str_data, pero recuerda los últimos valores descifrados.
+    Como cada cifrado usa un IV aleatorio, la clave de la caché identifica a una fila concreta.
+    """
+    return decrypt_str_data(encrypted_data)
+
+
+def blind_index(value: str):
+    """
+    HMAC-SHA256 determinista de un valor cifrado. Permite buscar por igualdad
+    (y aplicar índices únicos) sin guardar el valor en texto plano.
+    """
+    if value is None:
+        return None
+    return hmac.new(BLIND_INDEX_KEY, value.strip().encode(), hashlib.sha256).hexdigest()
@@ -0,0 +1,78 @@
+import os
+from collections import defaultdict
+from datetime import datetime
+
+from dotenv import load_dotenv
+
+from app.crud.email_outbox import enqueue_email
+from app.crud.notification_preference import get_digest_candidates, get_digest_notifications, claim_digest
+from app.db.database import SessionLocal
+from app.services.email_service import process_email_outbox
+
+load_dotenv()
+
+DIGEST_HOUR = int(os.getenv("DIGEST_HOUR", "7"))
+DIGEST_MAX_ITEMS = int(os.getenv("DIGEST_MAX_ITEMS", "20"))
+DIGEST_SUBJECT = "Resumen de notificaciones - Club de Ciclismo EPN"
+
+
+def send_notification_digests() -> int:
+    """
+    Agrupa las notificaciones sin leer de cada usuario suscrito en un solo correo.
+    Cada resumen se reclama con un UPDATE condicional antes de encolarlo, así que si
+    varios workers ejecutan el cron a la vez cada usuario recibe un solo correo. De cada
+    usuario reclamado se cargan solo las DIGEST_MAX_ITEMS notificaciones más recientes.
+    Los correos y las marcas se guardan en la misma transacción y luego se envían
+    todos con una sola sesión SMTP.
+    Devuelve el número de resúmenes generados.
+    """
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        candidates = get_digest_candidates(db, now)
+        if not candidates:
+            return 0
+
+        # Primero se reclaman los resúmenes: solo se cargan las notificaciones de los usuarios propios
+        claimed = [
+            candidate for candidate in candidates
+            if claim_digest(db, candidate.preference_id, candidate.last_digest_notification_id,
+                            candidate.max_notification_id, now)
+        ]
+
+        notifications_by_user = defaultdict(list)
+        bounds = {
+            candidate.user_id: (candidate.last_digest_notification_id, candidate.max_notification_id)
+            for candidate in claimed
+        }
+        for notification in get_digest_notifications(db, bounds, DIGEST_MAX_ITEMS):
+            notifications_by_user[notification.user_id].append(notification)
+
+        for candidate in claimed:
+            items = notifications_by_user[candidate.user_id]
+            context = {
+                "body": {
+                    "title": "Club de Ciclismo EPN",
+                    "total": candidate.unread_count,
+                    "remaining": candidate.unread_count - len(items),
+                    "notifications": [
+                        {
+                            "title": notification.title,
+                            "message": notification.message,
+                            "date": notification.created_at.strftime("%Y-%m-%d %H:%M"),
+                        }
+                        for notification in items
+                    ],
+                }
+            }
+            enqueue_email(db, candidate.email, DIGEST_SUBJECT, "digest.html", context, commit=False)
+
+        db.commit()
+        generated = len(claimed)
+        print(f"📬 [Digest] Se generaron {generated} resúmenes")
+    finally:
+        db.close()
+
+    if generated:
+        process_email_outbox(batch_size=generated)
+    return generated
@@ -1,46 +1,182 @@
+import json
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from pathlib import Path
 from dotenv import load_dotenv
 import os
-from jinja2 import Template
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, select_autoescape
+
+from app.crud.email_outbox import claim_email_batch, mark_email_sent, mark_email_failed
+from app.db.database import SessionLocal
+from app.services.metrics import record_email_outcome
 
 # Cargar variables de entorno
 load_dotenv()
 
+# En desarrollo las plantillas se recargan al modificarse; en producción se compilan una sola vez
+APP_ENV = os.getenv("APP_ENV", "production")
+TEMPLATES_DIR = Path(__file__).parent.parent / "resources" / "templates"
+EMAIL_TEMPLATE_CACHE_DIR = os.getenv("EMAIL_TEMPLATE_CACHE_DIR")
+
 EMAIL_USER = os.getenv("MAIL_USERNAME")
 EMAIL_PASS = os.getenv("MAIL_PASSWORD")
+MAIL_FROM = os.getenv("MAIL_FROM", EMAIL_USER)
+
+# Servidor SMTP (por defecto Gmail con SSL). Para pruebas locales, p. ej. con aiosmtpd:
+# MAIL_SERVER=localhost MAIL_PORT=8025 MAIL_SSL_TLS=false
+MAIL_SERVER = os.getenv("MAIL_SERVER", "smtp.gmail.com")
+MAIL_PORT = int(os.getenv("MAIL_PORT", "465"))
+MAIL_SSL_TLS = os.getenv("MAIL_SSL_TLS", "true").lower() == "true"
+MAIL_STARTTLS = os.getenv("MAIL_STARTTLS", "false").lower() == "true"
+MAIL_TIMEOUT_SECONDS = int(os.getenv("MAIL_TIMEOUT_SECONDS", "30"))
+
+# Configuración del worker de la bandeja de salida
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", "50"))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", "5"))
+EMAIL_OUTBOX_RETRY_SECONDS = int(os.getenv("EMAIL_OUTBOX_RETRY_SECONDS", "30"))
+EMAIL_OUTBOX_STALE_SECONDS = int(os.getenv("EMAIL_OUTBOX_STALE_SECONDS", "600"))
+EMAIL_OUTBOX_INTERVAL_SECONDS = int(os.getenv("EMAIL_OUTBOX_INTERVAL_SECONDS", "10"))
+
+
+# Entorno de Jinja2 compartido: guarda en memoria las plantillas compiladas
+# y su bytecode en disco para que otros workers no tengan que recompilarlas
+template_env = Environment(
+    loader=FileSystemLoader(TEMPLATES_DIR),
+    bytecode_cache=FileSystemBytecodeCache(EMAIL_TEMPLATE_CACHE_DIR),
+    auto_reload=APP_ENV == "development",
+    autoescape=select_autoescape(["html"]),
+)
+
+
+def precompile_email_templates():
+    """
+    Compila todas las plantillas al iniciar la aplicación.
+    """
+    for template_name in template_env.list_templates(extensions=["html"]):
+        template_env.get_template(template_name)
+
+
+def get_notification_template(notification_type: str) -> str:
+    """
+    Devuelve la plantilla propia del tipo de notificación
+    (notifications/<tipo>.html) o la plantilla genérica si no existe.
+    """
+    template = template_env.select_template([
+        f"notifications/{notification_type}.html",
+        "notification.html",
+    ])
+    return template.name
 
 
 def render_template(template_name: str, context: dict) -> str:
     """
     Renderiza una plantilla HTML con Jinja2.
     """
-    template_path = Path(__file__).parent.parent / "resources" / "templates" / template_name
-    template_content = template_path.read_text(encoding="utf-8")
-    template = Template(template_content)
-    return template.render(context)
+    return template_env.get_template(template_name).render(context)
 
 
-def send_email(recipient: str, subject: str, context: dict, template: str):
+def open_smtp_connection() -> smtplib.SMTP:
     """
-    Envía un correo electrónico con una plantilla HTML.
+    Abre y autentica una conexión SMTP que puede reutilizarse para varios correos.
     """
-    # Renderizar la plantilla
-    html_content = render_template(template, context)
+    if MAIL_SSL_TLS:
+        server = smtplib.SMTP_SSL(MAIL_SERVER, MAIL_PORT, timeout=MAIL_TIMEOUT_SECONDS)
+    else:
+        server = smtplib.SMTP(MAIL_SERVER, MAIL_PORT, timeout=MAIL_TIMEOUT_SECONDS)
+        if MAIL_STARTTLS:
+            server.starttls()
+
+    if EMAIL_USER and EMAIL_PASS:
+        server.login(EMAIL_USER, EMAIL_PASS)
+    return server
 
-    # Configurar el mensaje
+
+def build_message(recipient: str, subject: str, html_content: str) -> MIMEMultipart:
     message = MIMEMultipart("alternative")
-    message["From"] = EMAIL_USER
+    message["From"] = MAIL_FROM
     message["To"] = recipient
     message["Subject"] = subject
 
     # Agregar el contenido HTML
     html_part = MIMEText(html_content, "html")
     message.attach(html_part)
+    return message
 
-    # Conectar al servidor de Gmail
-    with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-        server.login(EMAIL_USER, EMAIL_PASS)
-        server.sendmail(EMAIL_USER, recipient, message.as_string())
\ No newline at end of file
+
+def send_email(recipient: str, subject: str, context: dict, template: str):
+    """
+    Envía un correo electrónico con una plantilla HTML.
+    """
+    # Renderizar la plantilla
+    html_content = render_template(template, context)
+    message = build_message(recipient, subject, html_content)
+
+    with open_smtp_connection() as server:
+        server.sendmail(MAIL_FROM, recipient, message.as_string())
+
+
+def _close_smtp_connection(server: smtplib.SMTP):
+    try:
+        server.quit()
+    except smtplib.SMTPException:
+        server.close()
+    except OSError:
+        pass
+
+
+def process_email_outbox(batch_size: int = EMAIL_OUTBOX_BATCH_SIZE) -> int:
+    """
+    Envía un lote de correos de la bandeja de salida reutilizando una sola
+    conexión SMTP. Los errores se reintentan con backoff exponencial.
+    Devuelve el número de correos enviados.
+    """
+    db = SessionLocal(expire_on_commit=False)
+    try:
+        emails = claim_email_batch(db, batch_size, EMAIL_OUTBOX_STALE_SECONDS)
+        if not emails:
+            return 0
+
+        sent = 0
+        server = None
+        try:
+            for index, email in enumerate(emails):
+                if server is None:
+                    try:
+                        server = open_smtp_connection()
+                    except (smtplib.SMTPException, OSError) as e:
+                        # Sin conexión no se puede enviar el resto del lote
+                        for pending in emails[index:]:
+                            mark_email_failed(db, pending, f"Conexión SMTP fallida: {e}",
+                                              EMAIL_OUTBOX_MAX_ATTEMPTS, EMAIL_OUTBOX_RETRY_SECONDS)
+                        record_email_outcome("connection_error", len(emails) - index)
+                        break
+
+                try:
+                    html_content = render_template(email.template, json.loads(email.context))
+                    message = build_message(email.recipient, email.subject, html_content)
+                    server.sendmail(MAIL_FROM, email.recipient, message.as_string())
+                    mark_email_sent(db, email)
+                    record_email_outcome("sent")
+                    sent += 1
+                except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError) as e:
+                    # Error propio del mensaje: la conexión sigue siendo válida
+                    mark_email_failed(db, email, str(e), EMAIL_OUTBOX_MAX_ATTEMPTS, EMAIL_OUTBOX_RETRY_SECONDS)
+                    record_email_outcome("rejected")
+                except OSError as e:
+                    # Se perdió la conexión: se reintenta el correo y se reconecta para el siguiente
+                    mark_email_failed(db, email, str(e), EMAIL_OUTBOX_MAX_ATTEMPTS, EMAIL_OUTBOX_RETRY_SECONDS)
+                    record_email_outcome("connection_error")
+                    _close_smtp_connection(server)
+                    server = None
+                except Exception as e:
+                    mark_email_failed(db, email, str(e), EMAIL_OUTBOX_MAX_ATTEMPTS, EMAIL_OUTBOX_RETRY_SECONDS)
+                    record_email_outcome("error")
+        finally:
+            if server is not None:
+                _close_smtp_connection(server)
+
+        print(f"📧 [Outbox] Enviados {sent} de {len(emails)} correos")
+        return sent
+    finally:
+        db.close()
@@ -0,0 +1,61 @@
+import os
+
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session
+
+from app.crud.event import get_upcoming_events
+from app.crud.event_participant import count_participants_by_event, get_registered_event_ids
+from app.crud.notification import count_unread_notifications
+from app.models.schema.feed import FeedEventResponse, FeedResponse
+from app.services.cache import TTLCache
+
+load_dotenv()
+
+FEED_CACHE_TTL_SECONDS = int(os.getenv("FEED_CACHE_TTL_SECONDS", "30"))
+FEED_CACHE_MAXSIZE = int(os.getenv("FEED_CACHE_MAXSIZE", "2048"))
+
+# Caché del feed por usuario; se invalida cuando el propio usuario cambia sus datos
+feed_cache = TTLCache(maxsize=FEED_CACHE_MAXSIZE, ttl=FEED_CACHE_TTL_SECONDS)
+
+
+def get_user_feed(db: Session, user_id: int, include_image: bool = False) -> FeedResponse:
+    """
+    Arma el feed del usuario: próximos eventos con su estado de inscripción,
+    número de participantes y el total de notificaciones sin leer.
+    """
+    cache_key = (user_id, include_image)
+    cached_feed = feed_cache.get(cache_key)
+    if cached_feed is not None:
+        return cached_feed
+
+    events = get_upcoming_events(db, include_image=include_image)
+    event_ids = [event.id for event in events]
+
+    # Consultas agrupadas en lugar de una consulta por evento
+    participant_counts = count_participants_by_event(db, event_ids)
+    registered_ids = get_registered_event_ids(db, user_id, event_ids)
+
+    feed = FeedResponse(
+        events=[
+            FeedEventResponse.from_orm(
+                event,
+                include_image=include_image,
+                is_registered=event.id in registered_ids,
+                participant_count=participant_counts.get(event.id, 0)
+            )
+            for event in events
+        ],
+        unread_notifications=count_unread_notifications(db, user_id)
+    )
+
+    feed_cache.set(cache_key, feed)
+    return feed
+
+
+def invalidate_user_feed(user_id: int):
+    for include_image in (False, True):
+        feed_cache.pop((user_id, include_image))
+
+
+def clear_feed_cache():
+    feed_cache.clear()
@@ -0,0 +1,158 @@
+import functools
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest,
+)
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.multiprocess import MultiProcessCollector
+
+# Con varios workers (gunicorn) se define PROMETHEUS_MULTIPROC_DIR para sumar las métricas de todos
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "Peticiones HTTP atendidas", ["method", "route", "status"]
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Latencia de las peticiones HTTP", ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "Peticiones HTTP en curso", multiprocess_mode="livesum"
+)
+THREADPOOL_IN_USE = Gauge(
+    "threadpool_threads_in_use", "Hilos del threadpool ocupados por endpoints síncronos", multiprocess_mode="livesum"
+)
+THREADPOOL_SIZE = Gauge(
+    "threadpool_threads_total", "Tamaño del threadpool de endpoints síncronos", multiprocess_mode="livesum"
+)
+SCHEDULER_JOB_DURATION = Histogram(
+    "scheduler_job_duration_seconds", "Duración de los trabajos programados", ["job"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300),
+)
+SCHEDULER_JOB_ROWS = Counter(
+    "scheduler_job_rows_processed_total", "Filas procesadas por los trabajos programados", ["job"]
+)
+SCHEDULER_JOB_ERRORS = Counter(
+    "scheduler_job_errors_total", "Trabajos programados que terminaron con error", ["job"]
+)
+EMAILS = Counter(
+    "emails_total", "Correos de la bandeja de salida por resultado", ["outcome"]
+)
+
+
+class PrometheusMiddleware:
+    """
+    Middleware ASGI que mide cada petición por plantilla de ruta (/event/{event_id}),
+    no por URL, para mantener acotado el número de series.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+            # FastAPI deja en el scope la ruta que atendió la petición
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            HTTP_REQUEST_DURATION.labels(scope["method"], route).observe(elapsed)
+            HTTP_REQUESTS.labels(scope["method"], route, str(status_code)).inc()
+
+
+class DatabasePoolCollector:
+    """
+    Lee el estado de los pools de conexiones en el momento de la consulta de /metrics.
+    """
+
+    def collect(self):
+        # Importación diferida para no crear los motores al importar las métricas
+        from app.db.async_session import async_engine
+        from app.db.database import engine
+        from app.db.pool import get_pool_status
+
+        gauges = {
+            "size": GaugeMetricFamily("db_pool_size", "Conexiones permanentes del pool", labels=["engine"]),
+            "checked_out": GaugeMetricFamily("db_pool_checked_out", "Conexiones en uso", labels=["engine"]),
+            "checked_in": GaugeMetricFamily("db_pool_checked_in", "Conexiones libres", labels=["engine"]),
+            "overflow": GaugeMetricFamily("db_pool_overflow", "Conexiones de overflow abiertas", labels=["engine"]),
+            "waits": GaugeMetricFamily("db_pool_waits", "Esperas acumuladas por una conexión", labels=["engine"]),
+            "wait_seconds_total": GaugeMetricFamily(
+                "db_pool_wait_seconds", "Segundos acumulados esperando una conexión", labels=["engine"]
+            ),
+            "timeouts": GaugeMetricFamily("db_pool_timeouts", "Esperas que agotaron el tiempo", labels=["engine"]),
+        }
+        for name, db_engine in (("primary", engine), ("async", async_engine.sync_engine)):
+            status = get_pool_status(db_engine)
+            for key, gauge in gauges.items():
+                if key in status:
+                    gauge.add_metric([name], status[key])
+        yield from gauges.values()
+
+
+REGISTRY.register(DatabasePoolCollector())
+
+
+def instrument_job(job_name: str):
+    """
+    Decorador para los trabajos del scheduler: mide su duración y, si devuelven
+    un entero, lo suma como filas procesadas.
+    """
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception:
+                SCHEDULER_JOB_ERRORS.labels(job_name).inc()
+                raise
+            finally:
+                SCHEDULER_JOB_DURATION.labels(job_name).observe(time.perf_counter() - start)
+            if isinstance(result, int):
+                SCHEDULER_JOB_ROWS.labels(job_name).inc(result)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def record_email_outcome(outcome: str, count: int = 1):
+    EMAILS.labels(outcome).inc(count)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """
+    Devuelve el contenido de /metrics en formato de texto de Prometheus.
+    """
+    import anyio.to_thread
+
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    THREADPOOL_IN_USE.set(limiter.borrowed_tokens)
+    THREADPOOL_SIZE.set(limiter.total_tokens)
+
+    if PROMETHEUS_MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry)
+        registry.register(DatabasePoolCollector())
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
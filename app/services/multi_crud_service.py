@@ -2,7 +2,8 @@ from fastapi import HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
-
+from app.core.security import invalidate_current_user
+from app.crud.refresh_token import revoke_user_refresh_tokens
 from app.crud.token import verify_token, mark_token_as_used
 from app.crud.user import update_password
 
@@ -20,4 +21,8 @@ def reset_password(db: Session, token_value: int, new_password: str):
 
     # Realiza el commit al final para garantizar atomicidad
     db.commit()
+    invalidate_current_user(user.email)
+
+    # Cierra las sesiones abiertas con la contraseña anterior
+    revoke_user_refresh_tokens(db, user.id)
     return {"detail": "Contraseña actualizada exitosamente."}
\ No newline at end of file
@@ -0,0 +1,184 @@
+import cProfile
+import functools
+import inspect
+import io
+import os
+import pstats
+import re
+import tempfile
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Optional
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
+
+from app.core.security import decode_token
+from app.models.domain.user import Role
+
+load_dotenv()
+
+# Directorio y número máximo de perfiles guardados (los más antiguos se eliminan)
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "club-ciclismo-profiles")))
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "50"))
+PROFILE_SUMMARY_LINES = int(os.getenv("PROFILE_SUMMARY_LINES", "40"))
+
+_PROFILE_ID = re.compile(r"^[0-9a-f]{32}$")
+
+# Perfilador de la petición actual (None si la petición no pidió perfilado)
+_current_profiler: ContextVar[Optional[cProfile.Profile]] = ContextVar("current_profiler", default=None)
+# cProfile no admite dos perfiladores activos a la vez; se perfila una petición por proceso
+_profiling_lock = threading.Lock()
+
+
+def _profile_requested(request: Request) -> bool:
+    return request.headers.get("x-profile") == "1" or request.query_params.get("profile") == "1"
+
+
+def _is_admin_request(request: Request) -> bool:
+    authorization = request.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        payload = decode_token(token, HTTPException(status_code=401))
+    except HTTPException:
+        return False
+    return payload.get("type") == "access" and payload.get("role") == Role.ADMIN.value
+
+
+def _profiled_endpoint(endpoint):
+    """
+    Envuelve el endpoint para ejecutarlo bajo el perfilador de la petición, si lo hay.
+    Los endpoints síncronos se perfilan dentro del hilo del threadpool donde se ejecutan.
+    En los async el perfilador queda activo en el hilo del event loop durante los await,
+    por lo que también registra las corrutinas de otras peticiones que avanzan mientras tanto.
+    """
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            profiler = _current_profiler.get()
+            if profiler is None:
+                return await endpoint(*args, **kwargs)
+            profiler.enable()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                profiler.disable()
+
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def sync_wrapper(*args, **kwargs):
+        profiler = _current_profiler.get()
+        if profiler is None:
+            return endpoint(*args, **kwargs)
+        return profiler.runcall(endpoint, *args, **kwargs)
+
+    return sync_wrapper
+
+
+def save_profile(profiler: cProfile.Profile, request: Request, elapsed: float, note: str = "") -> str:
+    """
+    Guarda el perfil (.prof, para snakeviz o pstats) y un resumen en texto (.txt).
+    Escribe en disco: desde el event loop debe llamarse con run_in_threadpool.
+    """
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    profile_id = uuid.uuid4().hex
+    profiler.dump_stats(PROFILE_DIR / f"{profile_id}.prof")
+
+    summary = io.StringIO()
+    summary.write(f"{request.method} {request.url.path} - {elapsed * 1000:.1f} ms\n")
+    if note:
+        summary.write(f"{note}\n")
+    summary.write("\n")
+    stats = pstats.Stats(profiler, stream=summary)
+    stats.sort_stats("cumulative").print_stats(PROFILE_SUMMARY_LINES)
+    (PROFILE_DIR / f"{profile_id}.txt").write_text(summary.getvalue(), encoding="utf-8")
+
+    _trim_profiles()
+    return profile_id
+
+
+def _trim_profiles():
+    profiles = sorted(PROFILE_DIR.glob("*.prof"), key=lambda path: path.stat().st_mtime)
+    for path in profiles[:max(len(profiles) - PROFILE_MAX_FILES, 0)]:
+        path.unlink(missing_ok=True)
+        path.with_suffix(".txt").unlink(missing_ok=True)
+
+
+def list_profiles() -> list[dict]:
+    if not PROFILE_DIR.exists():
+        return []
+    profiles = sorted(PROFILE_DIR.glob("*.prof"), key=lambda path: path.stat().st_mtime, reverse=True)
+    result = []
+    for path in profiles:
+        summary_path = path.with_suffix(".txt")
+        title = summary_path.read_text(encoding="utf-8").split("\n", 1)[0] if summary_path.exists() else ""
+        result.append({"id": path.stem, "request": title, "created_at": path.stat().st_mtime})
+    return result
+
+
+def get_profile_path(profile_id: str, extension: str) -> Path:
+    if not _PROFILE_ID.match(profile_id):
+        raise HTTPException(status_code=404, detail="Perfil no encontrado")
+    path = PROFILE_DIR / f"{profile_id}.{extension}"
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="Perfil no encontrado")
+    return path
+
+
+class ProfiledRoute(APIRoute):
+    """
+    Ruta que permite a un administrador perfilar una sola petición enviando
+    el encabezado X-Profile: 1 (o ?profile=1). La respuesta incluye X-Profile-Id,
+    que se consulta en /internal/profiles/{id}. Sin el encabezado no hay costo adicional.
+
+    Los perfiles de endpoints síncronos solo incluyen la petición perfilada. Los de
+    endpoints async incluyen además el trabajo de otras peticiones que se ejecutó en el
+    event loop durante sus await; se marcan con X-Profile-Status: includes-concurrent.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        self.profile_includes_concurrent = inspect.iscoroutinefunction(endpoint)
+        super().__init__(path, _profiled_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def profiled_handler(request: Request):
+            if not _profile_requested(request) or not _is_admin_request(request):
+                return await handler(request)
+
+            if not _profiling_lock.acquire(blocking=False):
+                response = await handler(request)
+                response.headers["X-Profile-Status"] = "busy"
+                return response
+
+            try:
+                profiler = cProfile.Profile()
+                token = _current_profiler.set(profiler)
+                start = time.perf_counter()
+                try:
+                    response = await handler(request)
+                finally:
+                    _current_profiler.reset(token)
+                elapsed = time.perf_counter() - start
+                note = ("Endpoint async: incluye el trabajo concurrente de otras peticiones en el event loop"
+                        if self.profile_includes_concurrent else "")
+                # Escribir el perfil y formatear pstats bloquea: se hace fuera del event loop
+                profile_id = await run_in_threadpool(save_profile, profiler, request, elapsed, note)
+            finally:
+                _profiling_lock.release()
+
+            response.headers["X-Profile-Id"] = profile_id
+            if self.profile_includes_concurrent:
+                response.headers["X-Profile-Status"] = "includes-concurrent"
+            return response
+
+        return profiled_handler
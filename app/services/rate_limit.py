@@ -0,0 +1,207 @@
+import math
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+
+load_dotenv()
+
+# "memory" (por proceso) o "redis" (compartido entre workers)
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+# Usar X-Forwarded-For solo si la aplicación está detrás de un proxy de confianza
+RATE_LIMIT_TRUST_PROXY = os.getenv("RATE_LIMIT_TRUST_PROXY", "false").lower() == "true"
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+
+
+class MemoryRateLimitBackend:
+    """
+    Ventana deslizante en memoria. Solo limita dentro del proceso actual.
+    """
+    blocking = False
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._hits = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, limit: int, window_seconds: int, charge: bool = True) -> float:
+        """
+        Registra un intento. Devuelve 0 si se permite o los segundos que faltan para reintentar.
+        Con charge=False solo consulta la ventana sin contar el intento.
+        """
+        now = time.monotonic()
+        with self._lock:
+            hits = self._hits.get(key)
+            if hits is None:
+                hits = deque()
+                self._hits[key] = hits
+            else:
+                self._hits.move_to_end(key)
+
+            while hits and hits[0] <= now - window_seconds:
+                hits.popleft()
+
+            if len(hits) >= limit:
+                return hits[0] + window_seconds - now
+
+            if charge:
+                hits.append(now)
+            # Evitar que la memoria crezca sin límite con IPs distintas
+            while len(self._hits) > self.max_keys:
+                self._hits.popitem(last=False)
+            return 0
+
+
+class RedisRateLimitBackend:
+    """
+    Ventana deslizante en Redis (sorted set por clave), compartida entre workers.
+    """
+    blocking = True
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requiere instalar el paquete 'redis'.")
+        self._client = redis.Redis.from_url(url)
+
+    def hit(self, key: str, limit: int, window_seconds: int, charge: bool = True) -> float:
+        now = time.time()
+        member = f"{now}:{uuid.uuid4().hex}"
+        redis_key = f"rate_limit:{key}"
+
+        if not charge:
+            pipe = self._client.pipeline()
+            pipe.zremrangebyscore(redis_key, 0, now - window_seconds)
+            pipe.zcard(redis_key)
+            pipe.zrange(redis_key, 0, 0, withscores=True)
+            _, total, oldest = pipe.execute()
+            if total >= limit:
+                oldest_score = oldest[0][1] if oldest else now
+                return max(oldest_score + window_seconds - now, 0.001)
+            return 0
+
+        pipe = self._client.pipeline()
+        pipe.zremrangebyscore(redis_key, 0, now - window_seconds)
+        pipe.zadd(redis_key, {member: now})
+        pipe.zcard(redis_key)
+        pipe.zrange(redis_key, 0, 0, withscores=True)
+        pipe.expire(redis_key, window_seconds)
+        _, _, total, oldest, _ = pipe.execute()
+
+        if total > limit:
+            # El intento rechazado no cuenta dentro de la ventana
+            self._client.zrem(redis_key, member)
+            oldest_score = oldest[0][1] if oldest else now
+            return max(oldest_score + window_seconds - now, 0.001)
+        return 0
+
+
+def _create_backend():
+    if RATE_LIMIT_BACKEND == "redis":
+        return RedisRateLimitBackend(RATE_LIMIT_REDIS_URL)
+    return MemoryRateLimitBackend()
+
+
+rate_limit_backend = _create_backend()
+
+
+def get_client_ip(request: Request) -> str:
+    if RATE_LIMIT_TRUST_PROXY:
+        forwarded_for = request.headers.get("x-forwarded-for")
+        if forwarded_for:
+            return forwarded_for.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+class RateLimit:
+    """
+    Dependencia de FastAPI que limita los intentos por IP y, opcionalmente, por cuenta
+    (campo del formulario). Se resuelve antes del endpoint, por lo que las peticiones
+    rechazadas no llegan a consultar la base de datos ni a calcular hashes.
+
+    Con account_failures_only=True el límite por cuenta cuenta solo los intentos fallidos
+    (el endpoint llama a record_account_failure) y se aplica por IP y cuenta, de modo que
+    nadie puede bloquear a otro miembro enviando intentos falsos con su correo.
+    """
+
+    def __init__(self, scope: str, ip_limit: int, window_seconds: int,
+                 account_limit: int = None, account_field: str = None,
+                 account_failures_only: bool = False):
+        self.scope = scope
+        self.ip_limit = ip_limit
+        self.window_seconds = window_seconds
+        self.account_limit = account_limit
+        self.account_field = account_field
+        self.account_failures_only = account_failures_only
+
+    async def _check(self, key: str, limit: int, charge: bool = True):
+        if rate_limit_backend.blocking:
+            retry_after = await run_in_threadpool(rate_limit_backend.hit, key, limit, self.window_seconds, charge)
+        else:
+            retry_after = rate_limit_backend.hit(key, limit, self.window_seconds, charge)
+
+        if retry_after > 0:
+            raise HTTPException(
+                status_code=429,
+                detail="Demasiados intentos. Intenta nuevamente más tarde.",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+    def _account_key(self, request: Request, account: str) -> str:
+        account = account.strip().lower()
+        if self.account_failures_only:
+            return f"{self.scope}:account:{get_client_ip(request)}:{account}"
+        return f"{self.scope}:account:{account}"
+
+    async def __call__(self, request: Request):
+        await self._check(f"{self.scope}:ip:{get_client_ip(request)}", self.ip_limit)
+
+        if self.account_field and self.account_limit:
+            form = await request.form()
+            account = form.get(self.account_field)
+            if isinstance(account, str) and account.strip():
+                await self._check(self._account_key(request, account), self.account_limit,
+                                  charge=not self.account_failures_only)
+
+    async def record_account_failure(self, request: Request, account: str):
+        """
+        Cuenta un intento fallido para la cuenta (solo con account_failures_only=True).
+        """
+        if not (self.account_failures_only and self.account_limit and account and account.strip()):
+            return
+        key = self._account_key(request, account)
+        if rate_limit_backend.blocking:
+            await run_in_threadpool(rate_limit_backend.hit, key, self.account_limit, self.window_seconds)
+        else:
+            rate_limit_backend.hit(key, self.account_limit, self.window_seconds)
+
+
+login_rate_limit = RateLimit(
+    "login",
+    ip_limit=int(os.getenv("LOGIN_RATE_LIMIT_PER_IP", "20")),
+    account_limit=int(os.getenv("LOGIN_RATE_LIMIT_PER_ACCOUNT", "5")),
+    window_seconds=int(os.getenv("LOGIN_RATE_LIMIT_WINDOW_SECONDS", "60")),
+    account_field="username",
+    account_failures_only=True,
+)
+
+reset_password_send_rate_limit = RateLimit(
+    "reset_password_send",
+    ip_limit=int(os.getenv("RESET_SEND_RATE_LIMIT_PER_IP", "5")),
+    account_limit=int(os.getenv("RESET_SEND_RATE_LIMIT_PER_ACCOUNT", "3")),
+    window_seconds=int(os.getenv("RESET_SEND_RATE_LIMIT_WINDOW_SECONDS", "900")),
+    account_field="email",
+)
+
+reset_password_code_rate_limit = RateLimit(
+    "reset_password_code",
+    ip_limit=int(os.getenv("RESET_CODE_RATE_LIMIT_PER_IP", "10")),
+    window_seconds=int(os.getenv("RESET_CODE_RATE_LIMIT_WINDOW_SECONDS", "300")),
+)
@@ -9,9 +9,13 @@ from app.models.domain.event_participant import EventParticipant
 from app.models.domain.user import User
 from app.models.domain.notification import Notification  # Importación agregada
 from app.crud.notification import create_notification
+from app.services.digest_service import send_notification_digests, DIGEST_HOUR
+from app.services.email_service import process_email_outbox, EMAIL_OUTBOX_INTERVAL_SECONDS
+from app.services.metrics import instrument_job
 
-def notificar_eventos_24h():
+def notificar_eventos_24h() -> int:
     db: Session = SessionLocal()
+    notificaciones_creadas = 0
     try:
         ecuador = pytz.timezone('America/Guayaquil')
         ahora = datetime.now(ecuador)
@@ -51,12 +55,21 @@ def notificar_eventos_24h():
                             title=titulo,
                             message=f"Recuerda que el evento {evento.event_type.value} {evento.route.name} es mañana a las {evento.creation_date.strftime('%H:%M')}. ¡Prepárate!"
                         )
+                        notificaciones_creadas += 1
                     else:
                         print(f"Notificación ya existente para usuario {user.id} y evento {evento.id}")
+        return notificaciones_creadas
     finally:
         db.close()
 
 def start_scheduler():
     scheduler = BackgroundScheduler()
-    scheduler.add_job(notificar_eventos_24h, "interval", minutes=1)
+    scheduler.add_job(instrument_job("event_reminders")(notificar_eventos_24h), "interval", minutes=1)
+    scheduler.add_job(
+        instrument_job("email_outbox")(process_email_outbox), "interval",
+        seconds=EMAIL_OUTBOX_INTERVAL_SECONDS, coalesce=True
+    )
+    scheduler.add_job(
+        instrument_job("notification_digests")(send_notification_digests), "cron", hour=DIGEST_HOUR, timezone=pytz.timezone('America/Guayaquil')
+    )
     scheduler.start()
@@ -0,0 +1,195 @@
+import csv
+import io
+import os
+
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.domain.persona import Persona
+from app.models.domain.user import User
+from app.models.schema.persona import PersonaCreate
+from app.models.schema.user import UserCreate, UserImportError, UserImportReport
+from app.services.crypt import get_password_hashes, blind_index
+from app.services.verify import verify_email, verify_structure_password, verify_cellphone_number, verify_location_field
+
+load_dotenv()
+
+USER_IMPORT_BATCH_SIZE = int(os.getenv("USER_IMPORT_BATCH_SIZE", "100"))
+
+REQUIRED_COLUMNS = [
+    "email", "password", "first_name", "last_name", "phone_number",
+    "city", "neighborhood", "blood_type", "skill_level",
+]
+
+
+def _parse_row(row: dict) -> UserCreate:
+    """
+    Construye y valida un UserCreate con las mismas reglas del registro.
+    Lanza ValueError con el mensaje a reportar si la fila no es válida.
+    """
+    values = {key: (value or "").strip() for key, value in row.items() if key}
+
+    try:
+        user_data = UserCreate(
+            email=values["email"],
+            password=values["password"],
+            role=values.get("role") or "Normal",
+            persona=PersonaCreate(
+                first_name=values["first_name"],
+                last_name=values["last_name"],
+                phone_number=values["phone_number"],
+                city=values["city"],
+                neighborhood=values["neighborhood"],
+                blood_type=values["blood_type"],
+                skill_level=values["skill_level"],
+                profile_picture=None
+            )
+        )
+    except ValidationError as e:
+        error = e.errors()[0]
+        field = ".".join(str(part) for part in error["loc"])
+        raise ValueError(f"{field}: {error['msg']}")
+
+    if not verify_email(user_data.email):
+        raise ValueError("Correo electrónico no válido.")
+    if not verify_structure_password(user_data.password):
+        raise ValueError("La contraseña debe tener al menos 8 caracteres, incluyendo una mayúscula y un número.")
+    if not verify_cellphone_number(user_data.persona.phone_number):
+        raise ValueError("Número de teléfono inválido. Debe tener entre 7 y 10 dígitos numéricos.")
+    try:
+        verify_location_field(user_data.persona.city, "Ciudad")
+        verify_location_field(user_data.persona.neighborhood, "Barrio")
+    except HTTPException as e:
+        raise ValueError(e.detail)
+
+    return user_data
+
+
+def _insert_rows_one_by_one(db: Session, rows, hashes, errors: list) -> int:
+    # Se usa cuando el lote falla por un conflicto, para identificar la fila exacta
+    created = 0
+    for (row_number, user_data), hashed_password in zip(rows, hashes):
+        try:
+            persona = Persona(**user_data.persona.model_dump())
+            db.add(User(
+                email=user_data.email,
+                hashed_password=hashed_password,
+                role=user_data.role,
+                person=persona
+            ))
+            db.commit()
+            created += 1
+        except IntegrityError:
+            db.rollback()
+            errors.append(UserImportError(
+                row=row_number,
+                email=user_data.email,
+                detail="El correo o el número de teléfono ya está registrado."
+            ))
+    return created
+
+
+def _import_batch(db: Session, batch: list, errors: list) -> int:
+    emails = [user_data.email for _, user_data in batch]
+    phone_hashes = [blind_index(user_data.persona.phone_number) for _, user_data in batch]
+
+    # Duplicados contra la base de datos, con una consulta por lote
+    existing_emails = {email for (email,) in db.query(User.email).filter(User.email.in_(emails))}
+    existing_phone_hashes = {
+        phone_hash for (phone_hash,) in
+        db.query(Persona.phone_number_hash).filter(Persona.phone_number_hash.in_(phone_hashes))
+    }
+
+    rows = []
+    for row_number, user_data in batch:
+        if user_data.email in existing_emails:
+            errors.append(UserImportError(row=row_number, email=user_data.email, detail="El correo ya está registrado."))
+        elif blind_index(user_data.persona.phone_number) in existing_phone_hashes:
+            errors.append(UserImportError(row=row_number, email=user_data.email,
+                                          detail="El número de teléfono ya está registrado."))
+        else:
+            rows.append((row_number, user_data))
+
+    if not rows:
+        return 0
+
+    hashes = get_password_hashes([user_data.password for _, user_data in rows])
+
+    try:
+        # El insert masivo no pasa por @validates, así que el índice ciego se calcula aquí
+        db.execute(insert(Persona), [
+            {**user_data.persona.model_dump(), "phone_number_hash": blind_index(user_data.persona.phone_number)}
+            for _, user_data in rows
+        ])
+        person_ids = dict(
+            db.query(Persona.phone_number_hash, Persona.id)
+            .filter(Persona.phone_number_hash.in_(
+                [blind_index(user_data.persona.phone_number) for _, user_data in rows]
+            ))
+            .all()
+        )
+        db.execute(insert(User), [
+            {
+                "email": user_data.email,
+                "hashed_password": hashed_password,
+                "role": user_data.role,
+                "person_id": person_ids[blind_index(user_data.persona.phone_number)],
+            }
+            for (_, user_data), hashed_password in zip(rows, hashes)
+        ])
+        db.commit()
+        return len(rows)
+    except IntegrityError:
+        db.rollback()
+        return _insert_rows_one_by_one(db, rows, hashes, errors)
+
+
+def import_users_from_csv(db: Session, file) -> UserImportReport:
+    """
+    Importa usuarios desde un CSV leyendo el archivo por partes. Cada lote se
+    valida, se hashea en paralelo y se inserta en una sola transacción.
+    """
+    reader = csv.DictReader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+
+    missing_columns = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or [])]
+    if missing_columns:
+        raise HTTPException(status_code=400, detail=f"Faltan columnas en el CSV: {', '.join(missing_columns)}")
+
+    created = 0
+    errors = []
+    batch = []
+    seen_emails = set()
+    seen_phones = set()
+
+    for row_number, row in enumerate(reader, start=2):
+        try:
+            user_data = _parse_row(row)
+        except ValueError as e:
+            errors.append(UserImportError(row=row_number, email=(row.get("email") or None), detail=str(e)))
+            continue
+
+        # Duplicados dentro del mismo archivo
+        if user_data.email in seen_emails:
+            errors.append(UserImportError(row=row_number, email=user_data.email,
+                                          detail="El correo está repetido en el archivo."))
+            continue
+        if user_data.persona.phone_number in seen_phones:
+            errors.append(UserImportError(row=row_number, email=user_data.email,
+                                          detail="El número de teléfono está repetido en el archivo."))
+            continue
+        seen_emails.add(user_data.email)
+        seen_phones.add(user_data.persona.phone_number)
+
+        batch.append((row_number, user_data))
+        if len(batch) >= USER_IMPORT_BATCH_SIZE:
+            created += _import_batch(db, batch, errors)
+            batch = []
+
+    if batch:
+        created += _import_batch(db, batch, errors)
+
+    return UserImportReport(created=created, errors=errors)
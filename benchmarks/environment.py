@@ -0,0 +1,38 @@
+import os
+
+DEFAULT_DATABASE_URL = "sqlite:///./benchmarks/bench.db"
+
+# Clave AES de 32 bytes solo para la base de benchmarks
+BENCHMARK_AES_KEY = "benchmark-aes-key-0123456789abcd"
+
+
+def configure_environment(database_url: str = None):
+    """
+    Define las variables de entorno que la aplicación lee al importarse. Debe llamarse
+    antes de importar cualquier módulo de `app`. Los valores ya definidos se respetan,
+    salvo la URL de la base de datos cuando se pasa explícitamente.
+    """
+    if database_url:
+        os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("DATABASE_URL", DEFAULT_DATABASE_URL)
+    os.environ.setdefault("DATABASE_STARTUP_SCHEMA", "none")
+    os.environ.setdefault("AES_KEY", BENCHMARK_AES_KEY)
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+    os.environ.setdefault("ALGORITHM", "HS256")
+    os.environ.setdefault("ACCESS_TOKEN_TTL_MINUTES", "60")
+    # Los límites de intentos de login falsearían la medición
+    os.environ.setdefault("LOGIN_RATE_LIMIT_PER_IP", "1000000000")
+    os.environ.setdefault("LOGIN_RATE_LIMIT_PER_ACCOUNT", "1000000000")
+    os.environ.setdefault("APP_ENV", "benchmark")
+
+
+def describe_database_url(url: str) -> str:
+    """
+    URL sin la contraseña, para guardarla junto a los resultados.
+    """
+    if "@" not in url or "://" not in url:
+        return url
+    scheme, rest = url.split("://", 1)
+    credentials, host = rest.rsplit("@", 1)
+    user = credentials.split(":", 1)[0]
+    return f"{scheme}://{user}:***@{host}"
@@ -0,0 +1,296 @@
+"""
+Genera datos sintéticos y tráfico concurrente para medir límites de capacidad:
+
+    python -m benchmarks.loadgen generate --reset --users 20000 --upcoming-ratio 0.3
+    python -m benchmarks.loadgen run --scenario rush --users 300
+    python -m benchmarks.loadgen run --scenario mixed --users 100 --duration 60 --base-url http://localhost:8000
+
+Sin --base-url la aplicación se ejecuta en el mismo proceso (transporte ASGI de httpx);
+con --base-url se prueba un servidor real (uvicorn/gunicorn con varios workers).
+
+Escenarios:
+- rush: apertura de inscripciones. Cada usuario virtual inicia sesión, ve los eventos
+  públicos y todos se inscriben en el mismo evento (el primero con inscripciones
+  abiertas) antes de consultar sus notificaciones.
+- mixed: tráfico sostenido durante --duration segundos: páginas públicas, consulta
+  periódica de notificaciones, feed y listado de eventos.
+
+Cuentan como error los fallos de conexión y todas las respuestas 4xx/5xx (los 429 del
+límite de intentos se muestran aparte). Los usuarios que no logran iniciar sesión
+abandonan el escenario y se informan por motivo.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from benchmarks.environment import configure_environment
+from benchmarks.run import percentile
+
+MIXED_OPERATIONS = [
+    # (operación, peso)
+    ("public_upcoming", 35),
+    ("next_event", 15),
+    ("poll_notifications", 30),
+    ("feed", 10),
+    ("event_list", 10),
+]
+
+
+class LoadStats:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.failures = defaultdict(int)
+        # Usuarios virtuales que no pudieron completar el escenario, por motivo
+        self.aborted = defaultdict(int)
+
+    def abort(self, reason: str):
+        self.aborted[reason] += 1
+
+    def record(self, operation: str, latency: float, status: int = None):
+        self.latencies[operation].append(latency)
+        if status is None:
+            self.failures[operation] += 1
+        else:
+            self.statuses[operation][status] += 1
+
+    def report(self, elapsed: float) -> dict:
+        operations = {}
+        total_requests = total_errors = 0
+        for operation, latencies in self.latencies.items():
+            latencies_ms = [latency * 1000 for latency in latencies]
+            statuses = self.statuses[operation]
+            # Errores: fallos de transporte y cualquier respuesta 4xx/5xx, incluidos los 429
+            # por límite de intentos y los 503 por saturación del pool de hashes
+            errors = self.failures[operation] + sum(count for status, count in statuses.items() if status >= 400)
+            throttled = statuses.get(429, 0)
+            total_requests += len(latencies)
+            total_errors += errors
+            operations[operation] = {
+                "requests": len(latencies),
+                "rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+                "p50_ms": round(percentile(latencies_ms, 50), 2),
+                "p95_ms": round(percentile(latencies_ms, 95), 2),
+                "p99_ms": round(percentile(latencies_ms, 99), 2),
+                "error_rate": round(errors / len(latencies), 4) if latencies else 0.0,
+                "throttled": throttled,
+                "statuses": {str(status): count for status, count in sorted(statuses.items())},
+                "transport_failures": self.failures[operation],
+            }
+        return {
+            "elapsed_seconds": round(elapsed, 2),
+            "requests": total_requests,
+            "rps": round(total_requests / elapsed, 2) if elapsed else 0.0,
+            "error_rate": round(total_errors / total_requests, 4) if total_requests else 0.0,
+            "aborted_users": dict(self.aborted),
+            "operations": operations,
+        }
+
+
+class VirtualUser:
+    def __init__(self, client, stats: LoadStats, user_id: int, think_time: float):
+        self.client = client
+        self.stats = stats
+        self.user_id = user_id
+        self.think_time = think_time
+        self.headers = {}
+
+    async def request(self, operation: str, method: str, url: str, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except Exception:
+            self.stats.record(operation, time.perf_counter() - start)
+            return None
+        self.stats.record(operation, time.perf_counter() - start, response.status_code)
+        return response
+
+    async def think(self):
+        if self.think_time:
+            await asyncio.sleep(random.uniform(0, self.think_time * 2))
+
+    async def login(self) -> bool:
+        from benchmarks.seed import BENCHMARK_PASSWORD, user_email
+
+        response = await self.request("login", "POST", "/auth/token", data={
+            "username": user_email(self.user_id), "password": BENCHMARK_PASSWORD,
+        })
+        if response is None or response.status_code != 200:
+            reason = "login sin respuesta" if response is None else f"login {response.status_code}"
+            self.stats.abort(reason)
+            return False
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return True
+
+    async def registration_rush(self, event_id: int):
+        if not await self.login():
+            return
+        await self.request("public_upcoming", "GET", "/event/public_upcoming")
+        await self.request("next_event", "GET", "/event/next", params={"include_image": False})
+        await self.request("register_event", "POST", "/participants/register_event",
+                           headers=self.headers, json={"event_id": event_id})
+        for _ in range(3):
+            await self.think()
+            await self.request("poll_notifications", "GET", "/notifications/", headers=self.headers)
+
+    async def mixed_traffic(self, deadline: float):
+        if not await self.login():
+            return
+        operations, weights = zip(*MIXED_OPERATIONS)
+        while time.perf_counter() < deadline:
+            operation = random.choices(operations, weights=weights)[0]
+            if operation == "public_upcoming":
+                await self.request(operation, "GET", "/event/public_upcoming")
+            elif operation == "next_event":
+                await self.request(operation, "GET", "/event/next", params={"include_image": False})
+            elif operation == "poll_notifications":
+                await self.request(operation, "GET", "/notifications/", headers=self.headers)
+            elif operation == "feed":
+                await self.request(operation, "GET", "/me/feed", headers=self.headers)
+            elif operation == "event_list":
+                await self.request(operation, "GET", "/event/", headers=self.headers)
+            await self.think()
+
+
+def _create_client(base_url: str, timeout: float):
+    import httpx
+
+    if base_url:
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        return httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits)
+
+    from app.main import app
+    from app.services.email_service import precompile_email_templates
+
+    precompile_email_templates()
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadgen", timeout=timeout)
+
+
+async def find_open_event(client) -> int:
+    """
+    Primer evento próximo que aún admite inscripciones. La inscripción cierra a las
+    23:59 del día anterior al evento, así que /event/next suele estar ya cerrado.
+    """
+    response = await client.get("/event/public_upcoming")
+    response.raise_for_status()
+    first_open_day = date.today() + timedelta(days=1)
+    for event in response.json():
+        if datetime.fromisoformat(event["creation_date"]).date() >= first_open_day:
+            return event["id"]
+    raise SystemExit("No hay eventos con inscripciones abiertas: siembra más eventos futuros (--upcoming-ratio)")
+
+
+async def run_load(args) -> dict:
+    stats = LoadStats()
+    # El usuario 1 es el administrador; los usuarios virtuales son miembros distintos
+    user_ids = random.sample(range(2, args.member_count + 2), k=min(args.users, args.member_count))
+
+    async with _create_client(args.base_url, args.timeout) as client:
+        # Todos los usuarios del escenario rush compiten por el mismo evento recién abierto
+        rush_event_id = await find_open_event(client) if args.scenario == "rush" else None
+        start = time.perf_counter()
+        deadline = start + args.ramp_up + args.duration
+        tasks = []
+        for index, user_id in enumerate(user_ids):
+            user = VirtualUser(client, stats, user_id, args.think_time)
+            delay = args.ramp_up * index / len(user_ids) if args.ramp_up else 0
+            if args.scenario == "rush":
+                coroutine = user.registration_rush(rush_event_id)
+            else:
+                coroutine = user.mixed_traffic(deadline)
+            tasks.append(asyncio.create_task(_delayed(delay, coroutine)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+
+    report = stats.report(elapsed)
+    report["scenario"] = args.scenario
+    report["virtual_users"] = len(user_ids)
+    if rush_event_id is not None:
+        report["rush_event_id"] = rush_event_id
+    report["target"] = args.base_url or "in-process"
+    return report
+
+
+async def _delayed(delay: float, coroutine):
+    if delay:
+        await asyncio.sleep(delay)
+    await coroutine
+
+
+def print_report(report: dict):
+    print(f"\nEscenario {report['scenario']} con {report['virtual_users']} usuarios virtuales "
+          f"contra {report['target']}")
+    print(f"{report['requests']} peticiones en {report['elapsed_seconds']} s "
+          f"({report['rps']} req/s), tasa de error {report['error_rate']:.2%}")
+    aborted = report["aborted_users"]
+    if aborted:
+        details = ", ".join(f"{reason}: {count}" for reason, count in sorted(aborted.items()))
+        print(f"⚠️ {sum(aborted.values())} de {report['virtual_users']} usuarios abandonaron el escenario ({details})")
+    print()
+    print(f"{'operación':<22}{'req':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          f"{'error':>9}{'429':>7}")
+    for operation, data in sorted(report["operations"].items()):
+        print(f"{operation:<22}{data['requests']:>8}{data['rps']:>10}{data['p50_ms']:>10}"
+              f"{data['p95_ms']:>10}{data['p99_ms']:>10}{data['error_rate']:>9.2%}{data['throttled']:>7}")
+
+
+def main(argv=None):
+    from benchmarks.seed import add_volume_arguments, volumes_from_args
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.loadgen")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    generate_parser = subparsers.add_parser("generate", help="Carga datos sintéticos con inserciones masivas")
+    generate_parser.add_argument("--database-url", default=None)
+    generate_parser.add_argument("--reset", action="store_true")
+    generate_parser.add_argument("--seed", type=int, default=42)
+    add_volume_arguments(generate_parser)
+
+    run_parser = subparsers.add_parser("run", help="Genera tráfico concurrente con un escenario")
+    run_parser.add_argument("--database-url", default=None,
+                            help="Base usada en el mismo proceso y de la que se leen los volúmenes sembrados")
+    run_parser.add_argument("--base-url", default=None, help="Servidor a probar (por defecto, en el mismo proceso)")
+    run_parser.add_argument("--scenario", choices=["rush", "mixed"], default="rush")
+    run_parser.add_argument("--users", type=int, default=200, help="Usuarios virtuales concurrentes")
+    run_parser.add_argument("--member-count", type=int, default=None,
+                            help="Miembros disponibles (por defecto, los usuarios sembrados menos el administrador)")
+    run_parser.add_argument("--duration", type=float, default=30, help="Segundos de tráfico del escenario mixed")
+    run_parser.add_argument("--ramp-up", type=float, default=0, help="Segundos para arrancar todos los usuarios")
+    run_parser.add_argument("--think-time", type=float, default=0.5, help="Pausa media entre acciones (s)")
+    run_parser.add_argument("--timeout", type=float, default=30)
+    run_parser.add_argument("--output", type=Path, default=None)
+
+    args = parser.parse_args(argv)
+    configure_environment(args.database_url)
+
+    if args.command == "generate":
+        from app.db.database import engine
+        from benchmarks.seed import seed_database
+
+        seed_database(engine, volumes_from_args(args), reset=args.reset, seed=args.seed)
+        return
+
+    if args.member_count is None:
+        from app.db.database import engine
+        from benchmarks.seed import load_seeded_volumes
+
+        volumes = load_seeded_volumes(engine)
+        if volumes is None:
+            parser.error("No se encontraron volúmenes sembrados en la base: usa --database-url o --member-count")
+        args.member_count = volumes.users - 1
+
+    report = asyncio.run(run_load(args))
+    print_report(report)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\nResultados guardados en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Mide latencia y throughput de los endpoints más usados con el cliente ASGI de pruebas
+(sin red ni servidor) y guarda los resultados en JSON:
+
+    python -m benchmarks.run --seed --reset
+    python -m benchmarks.run --baseline benchmarks/results/<anterior>.json
+
+Con --baseline se muestra la variación de p50/p95 respecto a una ejecución anterior.
+Sin --seed se usan los volúmenes que se guardaron al sembrar la base.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from benchmarks.environment import configure_environment, describe_database_url
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def percentile(values: list, percent: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(int(round(percent / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def summarize(latencies: list, elapsed: float, errors: int, query_counts: list) -> dict:
+    latencies_ms = [latency * 1000 for latency in latencies]
+    return {
+        "iterations": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(statistics.fmean(latencies_ms), 3) if latencies_ms else 0.0,
+        "p50_ms": round(percentile(latencies_ms, 50), 3),
+        "p95_ms": round(percentile(latencies_ms, 95), 3),
+        "p99_ms": round(percentile(latencies_ms, 99), 3),
+        "max_ms": round(max(latencies_ms), 3) if latencies_ms else 0.0,
+        "queries_per_request": round(statistics.fmean(query_counts), 2) if query_counts else None,
+    }
+
+
+def measure(call, iterations: int, warmup: int = 2) -> dict:
+    """
+    Ejecuta call(i) `iterations` veces. call devuelve una respuesta HTTP (se cuentan como
+    error los códigos >= 400 y se lee el número de consultas de Server-Timing) o None.
+    """
+    from app.db.query_counter import get_response_query_count
+
+    for i in range(warmup):
+        call(i)
+
+    latencies, query_counts, errors = [], [], 0
+    start = time.perf_counter()
+    for i in range(iterations):
+        call_start = time.perf_counter()
+        response = call(warmup + i)
+        latencies.append(time.perf_counter() - call_start)
+        if response is not None:
+            if response.status_code >= 400:
+                errors += 1
+            try:
+                query_counts.append(get_response_query_count(response))
+            except AssertionError:
+                pass
+    return summarize(latencies, time.perf_counter() - start, errors, query_counts)
+
+
+def run_benchmarks(iterations: int, volumes) -> dict:
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+    from app.services.email_service import precompile_email_templates
+    from app.services.scheduler_notifications import notificar_eventos_24h
+    from app.db.database import engine
+    from benchmarks.seed import BENCHMARK_PASSWORD, user_email, seed_reminder_window
+
+    # Sin `with`: no se ejecuta el startup, así el scheduler no corre durante la medición
+    precompile_email_templates()
+    client = TestClient(app)
+
+    def login(user_id):
+        return client.post("/auth/token", data={"username": user_email(user_id), "password": BENCHMARK_PASSWORD})
+
+    admin_token = login(1).json()["access_token"]
+    member_token = login(2).json()["access_token"]
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+    member_headers = {"Authorization": f"Bearer {member_token}"}
+
+    def create_event(i):
+        return client.post("/event/create", headers=admin_headers, json={
+            "event_type": "Entrenamiento",
+            "route_id": 1,
+            "meeting_point": "Parque La Carolina",
+            "creation_date": (datetime.now() + timedelta(days=7, minutes=i)).isoformat(),
+            "event_level": "Básico",
+            "event_mode": "Montaña",
+        })
+
+    def run_reminder_job(i):
+        notificar_eventos_24h()
+
+    def prepare_reminder_job():
+        # Sin eventos en la ventana de 24 h el job no hace nada y se mediría un no-op
+        added = seed_reminder_window(engine, volumes)
+        print(f"  {added} eventos con inscritos en la ventana del recordatorio")
+
+    # (llamada, iteraciones, preparación opcional que no se mide)
+    scenarios = {
+        "login": (lambda i: login(2 + i % max(volumes.users - 1, 1)), max(iterations // 10, 5), None),
+        "event_list": (lambda i: client.get("/event/", headers=member_headers), iterations, None),
+        "notifications": (lambda i: client.get("/notifications/", headers=member_headers), iterations, None),
+        "participants_by_event": (
+            lambda i: client.get(f"/participants/event/{1 + i % volumes.events}", headers=admin_headers),
+            iterations,
+            None,
+        ),
+        "event_create_fanout": (create_event, max(iterations // 20, 3), None),
+        "reminder_job": (run_reminder_job, max(iterations // 20, 3), prepare_reminder_job),
+    }
+
+    results = {}
+    for name, (call, scenario_iterations, prepare) in scenarios.items():
+        print(f"▶ {name} ({scenario_iterations} iteraciones)")
+        if prepare is not None:
+            prepare()
+        results[name] = measure(call, scenario_iterations)
+        print(f"  p50 {results[name]['p50_ms']} ms, p95 {results[name]['p95_ms']} ms, "
+              f"{results[name]['throughput_rps']} req/s, errores {results[name]['errors']}")
+    return results
+
+
+def compare_with_baseline(results: dict, baseline_path: Path):
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))["results"]
+    print(f"\nComparación con {baseline_path}:")
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            if previous[metric]:
+                change = (current[metric] - previous[metric]) / previous[metric] * 100
+                print(f"  {name} {metric}: {previous[metric]} -> {current[metric]} ({change:+.1f}%)")
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconocido"
+
+
+def main(argv=None):
+    from benchmarks.seed import add_volume_arguments, volumes_from_args
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run")
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--seed", action="store_true", help="Carga los datos sintéticos antes de medir")
+    parser.add_argument("--reset", action="store_true", help="Con --seed, elimina las tablas antes de cargar")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--baseline", type=Path, default=None)
+    add_volume_arguments(parser)
+    args = parser.parse_args(argv)
+
+    configure_environment(args.database_url)
+    from app.core.config import database_settings
+    from app.db.database import engine
+    from benchmarks.seed import seed_database, load_seeded_volumes
+
+    if args.seed:
+        volumes = volumes_from_args(args)
+        seed_database(engine, volumes, reset=args.reset)
+    else:
+        # Los escenarios dependen de lo que realmente hay en la base, no de los valores por defecto
+        volumes = load_seeded_volumes(engine)
+        if volumes is None:
+            parser.error("La base no tiene datos del benchmark: ejecuta con --seed o python -m benchmarks.seed")
+
+    results = run_benchmarks(args.iterations, volumes)
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "database_url": describe_database_url(database_settings.sqlalchemy_url),
+        "volumes": volumes.as_dict(),
+        "iterations": args.iterations,
+        "results": results,
+    }
+    output = args.output or RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\nResultados guardados en {output}")
+
+    if args.baseline:
+        compare_with_baseline(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Esquema inicial (el que creaba create_all en la primera versión)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "persona",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("first_name", sa.String(255), nullable=False),
+        sa.Column("last_name", sa.String(255), nullable=False),
+        sa.Column("phone_number", sa.String(15), nullable=False),
+        sa.Column("city", sa.String(255), nullable=False),
+        sa.Column("neighborhood", sa.String(255), nullable=False),
+        sa.Column("blood_type", sa.Enum("A_POSITIVE", "A_NEGATIVE", "B_POSITIVE", "B_NEGATIVE", "AB_POSITIVE",
+                                        "AB_NEGATIVE", "O_POSITIVE", "O_NEGATIVE", name="bloodtype"), nullable=False),
+        sa.Column("skill_level", sa.Enum("LOW", "MEDIUM", "HIGH", name="skilllevel"), nullable=False),
+        sa.Column("profile_picture", sa.LargeBinary(), nullable=True),
+    )
+    op.create_index("ix_persona_id", "persona", ["id"])
+
+    op.create_table(
+        "user",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String(100), nullable=False),
+        sa.Column("hashed_password", sa.String(255), nullable=False),
+        sa.Column("role", sa.Enum("ADMIN", "NORMAL", name="role"), nullable=False),
+        sa.Column("person_id", sa.Integer(), sa.ForeignKey("persona.id", ondelete="CASCADE"), nullable=False),
+    )
+    op.create_index("ix_user_id", "user", ["id"])
+    op.create_index("ix_user_email", "user", ["email"], unique=True)
+
+    op.create_table(
+        "token",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("user.id", ondelete="CASCADE")),
+        sa.Column("value", sa.String(255), nullable=False, unique=True),
+        sa.Column("date_creation", sa.DateTime()),
+        sa.Column("date_expiration", sa.DateTime(), nullable=False),
+        sa.Column("is_used", sa.Boolean()),
+    )
+    op.create_index("ix_token_id", "token", ["id"])
+
+    op.create_table(
+        "route",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("start_point", sa.String(255), nullable=False),
+        sa.Column("end_point", sa.String(255), nullable=False),
+        sa.Column("duration", sa.Integer(), nullable=False),
+    )
+    op.create_index("ix_route_id", "route", ["id"])
+
+    op.create_table(
+        "event",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("event_type", sa.Enum("TRAINING", "RIDE", name="eventtype"), nullable=False),
+        sa.Column("route_id", sa.Integer(), sa.ForeignKey("route.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("meeting_point", sa.String(255), nullable=False),
+        sa.Column("creation_date", sa.DateTime()),
+        sa.Column("event_level", sa.Enum("BASIC", "INTERMEDIATE", "ADVANCED", name="eventlevel"), nullable=False),
+        sa.Column("event_mode", sa.Enum("MOUNTAIN", "ROAD", name="eventmode"), nullable=False),
+        sa.Column("is_available", sa.Boolean()),
+        sa.Column("image", sa.LargeBinary(), nullable=True),
+    )
+    op.create_index("ix_event_id", "event", ["id"])
+
+    op.create_table(
+        "event_participant",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("event_id", sa.Integer(), sa.ForeignKey("event.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("user.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("registered_at", sa.DateTime()),
+    )
+    op.create_index("ix_event_participant_id", "event_participant", ["id"])
+
+    op.create_table(
+        "notification",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("user.id", ondelete="CASCADE")),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("is_read", sa.Boolean()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_notification_id", "notification", ["id"])
+
+
+def downgrade():
+    op.drop_table("notification")
+    op.drop_table("event_participant")
+    op.drop_table("event")
+    op.drop_table("route")
+    op.drop_table("token")
+    op.drop_table("user")
+    op.drop_table("persona")
@@ -0,0 +1,96 @@
+"""Tablas de refresh tokens, bandeja de salida de correos y preferencias de notificación
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+PREFERENCE_BOOLEAN_COLUMNS = {
+    "notify_training": True,
+    "notify_ride": True,
+    "notify_mountain": True,
+    "notify_road": True,
+    "notify_basic": True,
+    "notify_intermediate": True,
+    "notify_advanced": True,
+    "channel_in_app": True,
+    "channel_email": False,
+}
+
+
+def _has_table(name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade():
+    # Las bases creadas con create_all pueden tener ya alguna de estas tablas
+    if not _has_table("refresh_token"):
+        op.create_table(
+            "refresh_token",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("user.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("jti", sa.String(64), nullable=False),
+            sa.Column("date_creation", sa.DateTime()),
+            sa.Column("date_expiration", sa.DateTime(), nullable=False),
+            sa.Column("is_revoked", sa.Boolean()),
+        )
+        op.create_index("ix_refresh_token_id", "refresh_token", ["id"])
+        op.create_index("ix_refresh_token_user_id", "refresh_token", ["user_id"])
+        op.create_index("ix_refresh_token_jti", "refresh_token", ["jti"], unique=True)
+
+    if not _has_table("email_outbox"):
+        op.create_table(
+            "email_outbox",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("recipient", sa.String(255), nullable=False),
+            sa.Column("subject", sa.String(255), nullable=False),
+            sa.Column("template", sa.String(255), nullable=False),
+            sa.Column("context", sa.Text(), nullable=False),
+            sa.Column("status", sa.Enum("PENDING", "SENDING", "SENT", "FAILED", name="emailstatus"), nullable=False),
+            sa.Column("attempts", sa.Integer(), nullable=False),
+            sa.Column("next_attempt_at", sa.DateTime(), nullable=False),
+            sa.Column("claimed_at", sa.DateTime(), nullable=True),
+            sa.Column("sent_at", sa.DateTime(), nullable=True),
+            sa.Column("last_error", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime()),
+        )
+        op.create_index("ix_email_outbox_id", "email_outbox", ["id"])
+        op.create_index("ix_email_outbox_status_next_attempt_at", "email_outbox", ["status", "next_attempt_at"])
+
+    if not _has_table("notification_preference"):
+        op.create_table(
+            "notification_preference",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("user.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("digest_frequency", sa.Enum("NONE", "DAILY", "WEEKLY", name="digestfrequency"), nullable=False),
+            sa.Column("last_digest_at", sa.DateTime(), nullable=True),
+            sa.Column("last_digest_notification_id", sa.Integer(), nullable=False),
+            *[
+                sa.Column(column, sa.Boolean(), nullable=False, server_default=sa.true() if default else sa.false())
+                for column, default in PREFERENCE_BOOLEAN_COLUMNS.items()
+            ],
+        )
+        op.create_index("ix_notification_preference_id", "notification_preference", ["id"])
+        op.create_index("ix_notification_preference_user_id", "notification_preference", ["user_id"], unique=True)
+    else:
+        # Tablas creadas antes de que existieran los filtros por tipo de evento y canal
+        existing = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("notification_preference")}
+        for column, default in PREFERENCE_BOOLEAN_COLUMNS.items():
+            if column not in existing:
+                op.add_column(
+                    "notification_preference",
+                    sa.Column(column, sa.Boolean(), nullable=False, server_default=sa.true() if default else sa.false()),
+                )
+
+
+def downgrade():
+    op.drop_table("notification_preference")
+    op.drop_table("email_outbox")
+    op.drop_table("refresh_token")
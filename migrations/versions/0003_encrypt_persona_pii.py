@@ -0,0 +1,112 @@
+"""Cifra el teléfono y el tipo de sangre de persona y agrega el índice ciego del teléfono
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.domain.persona import BloodType
+from app.services.crypt import encrypt_str_data, decrypt_str_data, blind_index
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+persona = sa.table(
+    "persona",
+    sa.column("id", sa.Integer),
+    sa.column("phone_number", sa.String),
+    sa.column("blood_type", sa.String),
+    sa.column("phone_number_hash", sa.String),
+)
+
+
+def _persona_indexes() -> set:
+    return {index["name"] for index in sa.inspect(op.get_bind()).get_indexes("persona")}
+
+
+def _rewrite_rows(transform, pending=None):
+    """
+    Recorre persona por lotes de id y actualiza cada fila con transform(fila) -> dict.
+    Si se indica pending, solo se procesan las filas que cumplen esa condición.
+    """
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        query = (
+            sa.select(persona.c.id, persona.c.phone_number, persona.c.blood_type)
+            .where(persona.c.id > last_id)
+            .order_by(persona.c.id)
+            .limit(BATCH_SIZE)
+        )
+        if pending is not None:
+            query = query.where(pending)
+        rows = bind.execute(query).all()
+        if not rows:
+            break
+        for row in rows:
+            bind.execute(persona.update().where(persona.c.id == row.id).values(**transform(row)))
+        last_id = rows[-1].id
+
+
+def upgrade():
+    # Índice único sobre el teléfono en claro (bases creadas con create_all): deja de servir al cifrarlo
+    if "ix_persona_phone_number" in _persona_indexes():
+        op.drop_index("ix_persona_phone_number", table_name="persona")
+
+    # En MySQL el DDL no es transaccional: si un intento anterior se interrumpió, la columna ya existe
+    has_hash_column = "phone_number_hash" in {
+        column["name"] for column in sa.inspect(op.get_bind()).get_columns("persona")
+    }
+
+    # batch_alter_table recrea la tabla en SQLite, que no admite ALTER COLUMN
+    with op.batch_alter_table("persona") as batch:
+        batch.alter_column("phone_number", type_=sa.String(255), existing_type=sa.String(15),
+                           existing_nullable=False)
+        # El Enum guardaba el nombre (A_POSITIVE); la columna cifrada guarda el valor (A+)
+        batch.alter_column("blood_type", type_=sa.String(255), existing_nullable=False)
+        if not has_hash_column:
+            batch.add_column(sa.Column("phone_number_hash", sa.String(64), nullable=True))
+
+    def encrypt_row(row):
+        blood_type = BloodType[row.blood_type].value if row.blood_type in BloodType.__members__ else row.blood_type
+        return {
+            "phone_number": encrypt_str_data(row.phone_number),
+            "phone_number_hash": blind_index(row.phone_number),
+            "blood_type": encrypt_str_data(blood_type),
+        }
+
+    # Solo las filas sin índice ciego siguen en claro: reintentar no vuelve a cifrar las ya migradas
+    _rewrite_rows(encrypt_row, pending=persona.c.phone_number_hash.is_(None))
+
+    with op.batch_alter_table("persona") as batch:
+        batch.alter_column("phone_number_hash", type_=sa.String(64), existing_type=sa.String(64),
+                           nullable=False)
+        batch.create_index("ix_persona_phone_number_hash", ["phone_number_hash"], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table("persona") as batch:
+        batch.drop_index("ix_persona_phone_number_hash")
+
+    def decrypt_row(row):
+        return {
+            "phone_number": decrypt_str_data(row.phone_number),
+            "blood_type": BloodType(decrypt_str_data(row.blood_type)).name,
+        }
+
+    _rewrite_rows(decrypt_row)
+
+    with op.batch_alter_table("persona") as batch:
+        batch.drop_column("phone_number_hash")
+        batch.alter_column("blood_type",
+                           type_=sa.Enum("A_POSITIVE", "A_NEGATIVE", "B_POSITIVE", "B_NEGATIVE", "AB_POSITIVE",
+                                         "AB_NEGATIVE", "O_POSITIVE", "O_NEGATIVE", name="bloodtype"),
+                           existing_type=sa.String(255), existing_nullable=False)
+        batch.alter_column("phone_number", type_=sa.String(15), existing_type=sa.String(255),
+                           existing_nullable=False)
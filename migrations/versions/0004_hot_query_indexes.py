@@ -0,0 +1,35 @@
+"""Índices para los filtros más usados (eventos por fecha, notificaciones por usuario, participantes)
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_event_creation_date", "event", ["creation_date"]),
+    ("ix_notification_user_id_created_at", "notification", ["user_id", "created_at"]),
+    ("ix_event_participant_event_id_user_id", "event_participant", ["event_id", "user_id"]),
+]
+
+
+def _existing_indexes(table: str) -> set:
+    return {index["name"] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        # Las bases creadas con create_all ya pueden tenerlos
+        if name not in _existing_indexes(table):
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)